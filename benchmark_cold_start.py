@@ -0,0 +1,93 @@
+# benchmark_cold_start.py - Time a container-style cold start of the model layer
+"""
+Starts a fresh Python process per run and times the three things a new
+container pays for before its first transcription: importing backend,
+loading the model, and the first decode. Runs once loading from the Hugging
+Face snapshot and once from the artifacts written by prewarm_models.py.
+
+Each run is process-cold; the OS page cache may still hold the weight files
+from a previous run, which is also the case for a restarted container.
+
+Usage:
+    python benchmark_cold_start.py --language sw
+    python benchmark_cold_start.py --language en --precision bf16 --repeats 3
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+SRC_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "src")
+
+def child_run(language, precision):
+    """Measure one cold start in this (fresh) process and print it as JSON"""
+    start = time.perf_counter()
+    sys.path.insert(0, SRC_DIR)
+    import numpy as np
+    import backend
+    import_seconds = time.perf_counter() - start
+
+    model_name = backend.MODEL_NAMES[language]
+    start = time.perf_counter()
+    processor, model, device = backend._load_whisper_model(model_name, precision=precision)
+    load_seconds = time.perf_counter() - start
+
+    # Two seconds of low-level noise: enough to run the full decode path
+    audio_data = (0.01 * np.random.default_rng(0).standard_normal(32000)).astype(np.float32)
+    start = time.perf_counter()
+    backend.transcribe_audio(processor, model, device, audio_data, language, use_cache=False)
+    first_seconds = time.perf_counter() - start
+
+    artifact = backend._find_model_artifact(model_name, backend._artifact_dtype(precision, device))
+    print(json.dumps({
+        "import": import_seconds,
+        "load": load_seconds,
+        "first": first_seconds,
+        "artifact": str(artifact) if artifact else None,
+    }))
+
+def run_cold_start(language, precision, use_artifacts):
+    """Run child_run in a new interpreter and return its timings"""
+    env = dict(os.environ, KASUKU_USE_ARTIFACTS="1" if use_artifacts else "0",
+               KASUKU_MICROBATCH="0", TRANSFORMERS_VERBOSITY="error")
+    result = subprocess.run(
+        [sys.executable, os.path.abspath(__file__), "--child", "--language", language,
+         "--precision", precision],
+        env=env, capture_output=True, text=True, check=True
+    )
+    return json.loads(result.stdout.strip().splitlines()[-1])
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Cold-start timing report")
+    parser.add_argument("--language", choices=["sw", "en"], default="sw")
+    parser.add_argument("--precision", choices=["fp32", "int8", "bf16"], default="fp32")
+    parser.add_argument("--repeats", type=int, default=2)
+    parser.add_argument("--child", action="store_true", help=argparse.SUPPRESS)
+    args = parser.parse_args(argv)
+
+    if args.child:
+        child_run(args.language, args.precision)
+        return
+
+    print(f"\n📊 Cold start for {args.language} ({args.precision}), median of {args.repeats} fresh processes\n")
+    print(f"{'source':<12}{'import s':>10}{'load s':>10}{'first s':>10}{'total s':>10}")
+    print("-" * 52)
+    totals = {}
+    for source, use_artifacts in (("snapshot", False), ("artifact", True)):
+        runs = [run_cold_start(args.language, args.precision, use_artifacts) for _ in range(args.repeats)]
+        if use_artifacts and runs[0]["artifact"] is None:
+            print(f"{source:<12}  no artifact found, run prewarm_models.py first")
+            continue
+        timings = {key: statistics.median(run[key] for run in runs) for key in ("import", "load", "first")}
+        totals[source] = sum(timings.values())
+        print(f"{source:<12}{timings['import']:>10.2f}{timings['load']:>10.2f}"
+              f"{timings['first']:>10.2f}{totals[source]:>10.2f}")
+
+    if len(totals) == 2:
+        print(f"\nartifact load is {totals['snapshot'] / totals['artifact']:.2f}x faster end to end")
+
+if __name__ == "__main__":
+    main()
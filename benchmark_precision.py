@@ -0,0 +1,147 @@
+# benchmark_precision.py - Compare CPU inference precisions side by side
+"""
+Runs the same clips through fp32, int8 and bf16 CPU builds of a Whisper model
+and reports latency, model memory and agreement with the fp32 output.
+
+Usage:
+    python benchmark_precision.py --language sw clip1.wav clip2.wav
+    python benchmark_precision.py --language en --precisions fp32 int8 clips/*.wav
+
+If a clip has a sibling .txt file (clip1.txt) it is used as the reference
+transcript and the word error rate against it is reported as well.
+"""
+import argparse
+import io
+import os
+import statistics
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "src"))
+os.environ.setdefault("KASUKU_MICROBATCH", "0")
+
+def word_error_rate(reference, hypothesis):
+    """Word-level Levenshtein distance divided by the reference length"""
+    ref = reference.lower().split()
+    hyp = hypothesis.lower().split()
+    if not ref:
+        return 0.0 if not hyp else 1.0
+
+    previous = list(range(len(hyp) + 1))
+    for i, ref_word in enumerate(ref, 1):
+        current = [i] + [0] * len(hyp)
+        for j, hyp_word in enumerate(hyp, 1):
+            current[j] = min(
+                previous[j] + 1,
+                current[j - 1] + 1,
+                previous[j - 1] + (ref_word != hyp_word)
+            )
+        previous = current
+    return previous[-1] / len(ref)
+
+def model_size_mb(model):
+    """Serialized state_dict size, which also counts packed int8 weights"""
+    import torch
+    buffer = io.BytesIO()
+    torch.save(model.state_dict(), buffer)
+    return buffer.tell() / (1024 * 1024)
+
+def load_clips(paths):
+    """Load each clip at 16 kHz mono and pick up optional reference transcripts"""
+    import librosa
+    from backend import preprocess_audio
+
+    clips = []
+    for path in paths:
+        audio_data, sample_rate = librosa.load(path, sr=16000, mono=True)
+        audio_data, _ = preprocess_audio(audio_data, sample_rate)
+        reference = None
+        reference_path = os.path.splitext(path)[0] + ".txt"
+        if os.path.exists(reference_path):
+            with open(reference_path, encoding="utf-8") as f:
+                reference = f.read().strip()
+        clips.append((os.path.basename(path), audio_data, reference))
+    return clips
+
+def run_precision(model_name, precision, clips, language, repeats):
+    """Transcribe every clip `repeats` times, returning timings and outputs"""
+    import torch
+    import backend
+
+    start = time.perf_counter()
+    processor, model, device = backend._load_whisper_model(
+        model_name, precision=precision, device="cpu"
+    )
+    load_seconds = time.perf_counter() - start
+
+    results = {}
+    for name, audio_data, _ in clips:
+        timings = []
+        transcription = ""
+        for _ in range(repeats):
+            # Same seed for every precision so Swahili sampling is comparable
+            torch.manual_seed(0)
+            start = time.perf_counter()
+            transcription = backend.transcribe_audio(
+                processor, model, device, audio_data, language, use_cache=False
+            )
+            timings.append(time.perf_counter() - start)
+        results[name] = (statistics.median(timings), transcription or "")
+
+    size_mb = model_size_mb(model)
+    del model
+    return load_seconds, size_mb, results
+
+def main(argv=None):
+    import backend
+
+    parser = argparse.ArgumentParser(description="CPU precision latency/accuracy report")
+    parser.add_argument("clips", nargs="+", help="Audio files to transcribe")
+    parser.add_argument("--language", choices=sorted(backend.MODEL_NAMES), default="sw")
+    parser.add_argument("--precisions", nargs="+", default=["fp32", "int8", "bf16"],
+                        choices=["fp32", "int8", "bf16"])
+    parser.add_argument("--repeats", type=int, default=3)
+    parser.add_argument("--threads", type=int, default=None, help="torch.set_num_threads value")
+    args = parser.parse_args(argv)
+
+    import torch
+    if args.threads:
+        torch.set_num_threads(args.threads)
+
+    model_name = backend.MODEL_NAMES[args.language]
+    clips = load_clips(args.clips)
+    precisions = ["fp32"] + [p for p in args.precisions if p != "fp32"]
+
+    print(f"\n📊 {model_name} on CPU ({torch.get_num_threads()} threads, {args.repeats} repeats)\n")
+    report = {}
+    for precision in precisions:
+        if precision == "bf16" and not backend._cpu_supports_bf16():
+            print("⚠️  Skipping bf16: not supported on this CPU")
+            continue
+        print(f"⏳ Running {precision}...")
+        report[precision] = run_precision(model_name, precision, clips, args.language, args.repeats)
+
+    baseline = report["fp32"][2]
+    print(f"\n{'precision':<10}{'load s':>9}{'size MB':>10}{'total s':>10}{'speedup':>9}{'WER vs fp32':>13}{'WER vs ref':>12}")
+    print("-" * 73)
+    baseline_total = sum(latency for latency, _ in baseline.values())
+    for precision, (load_seconds, size_mb, results) in report.items():
+        total = sum(latency for latency, _ in results.values())
+        agreement = statistics.mean(
+            word_error_rate(baseline[name][1], results[name][1]) for name in results
+        )
+        ref_scores = [
+            word_error_rate(reference, results[name][1])
+            for name, _, reference in clips if reference is not None
+        ]
+        ref_wer = f"{statistics.mean(ref_scores):.3f}" if ref_scores else "n/a"
+        print(f"{precision:<10}{load_seconds:>9.2f}{size_mb:>10.1f}{total:>10.2f}"
+              f"{baseline_total / total:>8.2f}x{agreement:>13.3f}{ref_wer:>12}")
+
+    print("\nPer-clip latency (s):")
+    for name, _, _ in clips:
+        row = "  ".join(f"{p}={report[p][2][name][0]:.2f}" for p in report)
+        print(f"  {name}: {row}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,104 @@
+# benchmark_resample.py - Compare backend.resample_audio with librosa.resample
+"""
+Times backend.resample_audio against the previous librosa.resample path on
+synthetic browser-rate recordings (44.1 and 48 kHz) of 1, 10 and 60 minutes,
+and reports how closely the outputs agree. Both the libsoxr engine and the
+cached-filter scipy fallback are measured; "cold" is the first call for a
+rate pair in the process, "warm" the best of the repeats after it.
+
+Usage:
+    python benchmark_resample.py
+    python benchmark_resample.py --minutes 1 10 --rates 48000
+"""
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "src"))
+
+import numpy as np
+
+def synthetic_recording(minutes, sample_rate, seed=0):
+    """Speech-like test signal: modulated harmonics plus a little noise"""
+    rng = np.random.default_rng(seed)
+    t = np.arange(int(minutes * 60 * sample_rate), dtype=np.float32) / sample_rate
+    pitch = 140 + 40 * np.sin(2 * np.pi * 0.7 * t)
+    phase = 2 * np.pi * np.cumsum(pitch) / sample_rate
+    signal = sum(np.sin(k * phase) / k for k in range(1, 6)) * (0.5 + 0.5 * np.sin(2 * np.pi * 3 * t))
+    signal += 0.01 * rng.standard_normal(len(t))
+    return (0.3 * signal).astype(np.float32)
+
+def time_call(func, repeats):
+    """Best wall-clock time over `repeats` calls, plus the last result"""
+    best = float("inf")
+    result = None
+    for _ in range(repeats):
+        start = time.perf_counter()
+        result = func()
+        best = min(best, time.perf_counter() - start)
+    return best, result
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Resampling microbenchmark")
+    parser.add_argument("--minutes", nargs="+", type=float, default=[1, 10, 60])
+    parser.add_argument("--rates", nargs="+", type=int, default=[44100, 48000])
+    parser.add_argument("--repeats", type=int, default=3)
+    args = parser.parse_args(argv)
+
+    import librosa
+    import backend
+
+    if not backend.SOXR_AVAILABLE:
+        print("❌ soxr is not installed (it normally comes with librosa>=0.10)")
+        return
+
+    print(f"\n📊 Resampling to 16 kHz (seconds, warm = best of {args.repeats})\n")
+    print(f"{'input':<16}{'librosa cold':>13}{'librosa warm':>13}{'soxr cold':>11}{'soxr warm':>11}"
+          f"{'poly cold':>11}{'poly warm':>11}{'speedup':>9}{'max diff':>10}")
+    print("-" * 105)
+
+    def engine(use_soxr):
+        def run():
+            backend.SOXR_AVAILABLE = use_soxr
+            return backend.resample_audio(audio_data, sample_rate)
+        return run
+
+    for sample_rate in args.rates:
+        librosa_cold = True
+        for minutes in args.minutes:
+            audio_data = synthetic_recording(minutes, sample_rate)
+            run_librosa = lambda: librosa.resample(audio_data, orig_sr=sample_rate, target_sr=16000)
+
+            timings = []
+            if librosa_cold:
+                timings.append(time_call(run_librosa, 1)[0])
+                librosa_cold = False
+            else:
+                timings.append(float("nan"))
+            librosa_time, expected = time_call(run_librosa, args.repeats)
+            timings.append(librosa_time)
+
+            for use_soxr in (True, False):
+                if not use_soxr:
+                    # Cold includes designing the polyphase filter
+                    backend._polyphase_filter.cache_clear()
+                timings.append(time_call(engine(use_soxr), 1)[0])
+                warm_time, actual = time_call(engine(use_soxr), args.repeats)
+                timings.append(warm_time)
+                if use_soxr:
+                    soxr_time, soxr_output = warm_time, actual
+
+            length = min(len(expected), len(soxr_output))
+            max_diff = float(np.max(np.abs(expected[:length] - soxr_output[:length])))
+            label = f"{minutes:g} min @ {sample_rate // 1000}k"
+            print(f"{label:<16}" + "".join(f"{t:>13.3f}" for t in timings[:2])
+                  + "".join(f"{t:>11.3f}" for t in timings[2:])
+                  + f"{librosa_time / soxr_time:>8.2f}x{max_diff:>10.1e}")
+            del audio_data, expected, actual, soxr_output
+
+    backend.SOXR_AVAILABLE = True
+    print("\nspeedup = librosa warm / soxr warm; max diff = librosa vs soxr engine output")
+
+if __name__ == "__main__":
+    main()
@@ -7,20 +7,37 @@ CACHE_ENV_VARS = {
     "HF_HOME": "/root/.cache/huggingface",
     "PYTHONPATH": "/app/src",
     "TRANSFORMERS_VERBOSITY": "error",
+    "KASUKU_ONNX_DIR": "/root/.cache/kasuku/onnx",
+    "KASUKU_ARTIFACT_DIR": "/root/.cache/kasuku/artifacts",
+    # Whisper models resident at once; least recently used ones are unloaded
+    "KASUKU_MODEL_MEMORY_BUDGET_MB": "8192",
+    # Run dummy clips through the models when a container starts
+    "KASUKU_WARMUP": "1",
+    # Synthesized speech, kept on a volume shared by restarts and replicas
+    "KASUKU_TTS_CACHE_DIR": "/cache/tts",
+    # Speak with espeak-ng when Google TTS fails or is slow
+    "KASUKU_TTS_FALLBACK": "espeak",
+    # Saved transcriptions: each container's database stays on local disk,
+    # copies on the history volume are shared and merged (see run_streamlit_asgi)
+    "KASUKU_HISTORY_BACKUP_DIR": "/data/history",
 }
 
 # Build image
 image = (
     modal.Image.debian_slim(python_version="3.11")
-    .apt_install("ffmpeg", "libsndfile1")
+    .apt_install("ffmpeg", "libsndfile1", "espeak-ng")
     .pip_install_from_requirements("requirements.txt")
     .env(CACHE_ENV_VARS)
     .add_local_file("prewarm_models.py", "/app/prewarm_models.py", copy=True)
     .run_commands("python /app/prewarm_models.py")
+    .add_local_file("export_onnx.py", "/app/export_onnx.py", copy=True)
+    .run_commands("python /app/export_onnx.py || echo 'ONNX export failed, KASUKU_ENGINE=onnx will export at startup'")
     .add_local_dir("src", "/app/src")
 )
 
 app = modal.App("kasuku-transcriber", image=image)
+tts_cache = modal.Volume.from_name("kasuku-tts-cache", create_if_missing=True)
+history_data = modal.Volume.from_name("kasuku-history", create_if_missing=True)
 
 @app.function(
     gpu="A10",
@@ -28,7 +45,8 @@ app = modal.App("kasuku-transcriber", image=image)
     memory=16384,
     timeout=3600,
     scaledown_window=300,
-    min_containers=1  # ✅ CHANGED: keep_warm -> min_containers
+    min_containers=1,  # ✅ CHANGED: keep_warm -> min_containers
+    volumes={"/cache/tts": tts_cache, "/data/history": history_data},
 )
 @modal.asgi_app()
 def run_streamlit_asgi():
@@ -39,6 +57,12 @@ def run_streamlit_asgi():
     os.chdir("/app")
     os.environ.update(CACHE_ENV_VARS)
     
+    # Persist each history backup on the volume right away, and see the
+    # other containers' latest copies before merging them
+    import backend
+    backend.on_history_backup(history_data.commit)
+    backend.on_history_sync(history_data.reload)
+    
     # Updated Streamlit config without conflicting options
     sys.argv = [
         "streamlit", "run", "src/app.py",
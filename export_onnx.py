@@ -0,0 +1,103 @@
+# export_onnx.py - Export the Whisper checkpoints for the ONNX Runtime engine
+"""
+Exports each checkpoint to ONNX (encoder, decoder and decoder-with-past) so
+the app can run with KASUKU_ENGINE=onnx without exporting at startup.
+
+Runs at image build time right after prewarm_models.py:
+    python export_onnx.py
+    python export_onnx.py --verify clip.wav   # compare against transformers
+"""
+import argparse
+import os
+import sys
+import time
+from pathlib import Path
+
+MODEL_NAMES = {
+    "sw": "smainye/whisper-small-kenyan-swahili-nonstandard",
+    "en": "smainye/whisper-small-kenyan-english-nonstandard",
+}
+
+# Must match backend.onnx_export_path()
+ONNX_EXPORT_DIR = Path(os.getenv("KASUKU_ONNX_DIR", Path.home() / ".cache" / "kasuku" / "onnx"))
+
+def export_path(model_name):
+    return ONNX_EXPORT_DIR / model_name.replace("/", "--")
+
+def export_model(model_name, force=False):
+    """Export one checkpoint, skipping it if an export already exists"""
+    from optimum.onnxruntime import ORTModelForSpeechSeq2Seq
+    from transformers import WhisperProcessor
+
+    output_dir = export_path(model_name)
+    if (output_dir / "encoder_model.onnx").exists() and not force:
+        print(f"   ✅ Already exported to {output_dir}")
+        return output_dir
+
+    start_time = time.time()
+    model = ORTModelForSpeechSeq2Seq.from_pretrained(model_name, export=True, use_cache=True)
+    model.save_pretrained(output_dir)
+    WhisperProcessor.from_pretrained(model_name).save_pretrained(output_dir)
+    print(f"   ✅ Exported to {output_dir} in {time.time() - start_time:.1f}s")
+    return output_dir
+
+def verify_model(model_name, language, clip_paths):
+    """Transcribe clips with both engines and report whether the strings match"""
+    import librosa
+    import torch
+    from optimum.onnxruntime import ORTModelForSpeechSeq2Seq
+    from transformers import WhisperProcessor, WhisperForConditionalGeneration
+
+    processor = WhisperProcessor.from_pretrained(model_name)
+    engines = {
+        "transformers": WhisperForConditionalGeneration.from_pretrained(model_name).eval(),
+        "onnx": ORTModelForSpeechSeq2Seq.from_pretrained(export_path(model_name), use_cache=True),
+    }
+
+    all_match = True
+    for path in clip_paths:
+        audio_data, _ = librosa.load(path, sr=16000, mono=True, duration=30)
+        features = processor(audio_data, sampling_rate=16000, return_tensors="pt").input_features
+        outputs = {}
+        for name, model in engines.items():
+            start_time = time.time()
+            with torch.no_grad():
+                # Greedy beam search so both engines are deterministic
+                ids = model.generate(features, language=language, task="transcribe", num_beams=5, do_sample=False)
+            outputs[name] = (processor.batch_decode(ids, skip_special_tokens=True)[0].strip(), time.time() - start_time)
+
+        match = outputs["transformers"][0] == outputs["onnx"][0]
+        all_match = all_match and match
+        print(f"   {'✅' if match else '⚠️ '} {os.path.basename(path)}: "
+              f"transformers {outputs['transformers'][1]:.2f}s, onnx {outputs['onnx'][1]:.2f}s")
+        if not match:
+            print(f"      transformers: {outputs['transformers'][0]}")
+            print(f"      onnx:         {outputs['onnx'][0]}")
+    return all_match
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Export Kasuku Whisper models to ONNX")
+    parser.add_argument("--languages", nargs="+", default=sorted(MODEL_NAMES), choices=sorted(MODEL_NAMES))
+    parser.add_argument("--force", action="store_true", help="Re-export even if an export exists")
+    parser.add_argument("--verify", nargs="*", default=None, metavar="CLIP",
+                        help="Audio clips used to check ONNX output against transformers")
+    args = parser.parse_args(argv)
+
+    print("🚀 Exporting Whisper models to ONNX...")
+    ok = True
+    for i, language in enumerate(args.languages, 1):
+        model_name = MODEL_NAMES[language]
+        print(f"\n📦 [{i}/{len(args.languages)}] {model_name}")
+        try:
+            export_model(model_name, force=args.force)
+            if args.verify:
+                ok = verify_model(model_name, language, args.verify) and ok
+        except Exception as e:
+            print(f"   ⚠️  Failed to export {model_name}: {str(e)[:200]}")
+            ok = False
+
+    print("\n✅ ONNX export complete." if ok else "\n⚠️  ONNX export finished with problems.")
+    return 0 if ok else 1
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,160 @@
+# fake_tts_server.py - Local stand-in for the Google Cloud Text-to-Speech REST API
+"""
+Answers POST /v1/text:synthesize like Google does, with a short tone whose
+length follows the text, so the TTS client pool and the speak buttons can be
+exercised without credentials or network access. The tone is encoded as the
+request's audioConfig.audioEncoding asks (MP3 or LINEAR16 WAV); other
+encodings are rejected with 400 INVALID_ARGUMENT.
+
+    python fake_tts_server.py --port 8090 --latency-ms 300
+    KASUKU_TTS_ENDPOINT=http://127.0.0.1:8090 streamlit run src/app.py
+
+GET /stats returns the number of requests served and the peak concurrency.
+--slow-rate/--slow-ms make a fraction of requests much slower than the rest,
+for measuring tail latency and the fallback engine (load_test_tts.py).
+"""
+import argparse
+import base64
+import io
+import json
+import sys
+import threading
+import time
+import wave
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlparse
+
+import numpy as np
+
+SAMPLE_RATE = 16000
+
+# AudioEncoding names and the numbers REST clients may send instead
+AUDIO_ENCODINGS = {"LINEAR16": "LINEAR16", "MP3": "MP3", 1: "LINEAR16", 2: "MP3"}
+
+def synthesize_tone(text, language_code="", audio_encoding="LINEAR16"):
+    """
+    Audio bytes in audio_encoding (MP3, or LINEAR16 as WAV like Google
+    returns it): a tone per word, pitched by language so voices are
+    distinguishable. Raises ValueError for other encodings.
+    """
+    encoding = AUDIO_ENCODINGS.get(audio_encoding)
+    if encoding is None:
+        raise ValueError(f"Unsupported audioEncoding: {audio_encoding}")
+    words = max(1, len(text.split()))
+    duration = min(30.0, 0.25 * words)
+    t = np.arange(int(duration * SAMPLE_RATE)) / SAMPLE_RATE
+    pitch = 330.0 if language_code.startswith("sw") else 440.0
+    envelope = np.abs(np.sin(np.pi * t / 0.25))  # one bump per word
+    samples = (0.2 * envelope * np.sin(2 * np.pi * pitch * t) * 32767).astype("<i2")
+
+    buffer = io.BytesIO()
+    if encoding == "MP3":
+        import soundfile as sf
+        sf.write(buffer, samples, SAMPLE_RATE, format="MP3")
+        return buffer.getvalue()
+    with wave.open(buffer, "wb") as wav:
+        wav.setnchannels(1)
+        wav.setsampwidth(2)
+        wav.setframerate(SAMPLE_RATE)
+        wav.writeframes(samples.tobytes())
+    return buffer.getvalue()
+
+class FakeTTSHandler(BaseHTTPRequestHandler):
+    """HTTP handler for /v1/text:synthesize and /stats"""
+
+    latency = 0.0
+    failure_rate = 0.0
+    slow_rate = 0.0
+    slow_latency = 0.0
+    stats = None
+    stats_lock = threading.Lock()
+
+    def _send_json(self, status, payload):
+        body = json.dumps(payload).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_GET(self):
+        if urlparse(self.path).path == "/stats":
+            with self.stats_lock:
+                self._send_json(200, dict(self.stats))
+        else:
+            self._send_json(404, {"error": {"code": 404, "message": "Not found"}})
+
+    def do_POST(self):
+        if urlparse(self.path).path != "/v1/text:synthesize":
+            self._send_json(404, {"error": {"code": 404, "message": "Not found"}})
+            return
+
+        length = int(self.headers.get("Content-Length", 0))
+        request = json.loads(self.rfile.read(length) or b"{}")
+        with self.stats_lock:
+            self.stats["requests"] += 1
+            self.stats["active"] += 1
+            self.stats["peak_concurrency"] = max(self.stats["peak_concurrency"], self.stats["active"])
+            fail = self.failure_rate > 0 and np.random.random() < self.failure_rate
+            slow = self.slow_rate > 0 and np.random.random() < self.slow_rate
+        try:
+            time.sleep(self.latency + (self.slow_latency if slow else 0.0))
+            if fail:
+                self._send_json(503, {"error": {"code": 503, "message": "Injected failure",
+                                                "status": "UNAVAILABLE"}})
+                return
+            text = request.get("input", {}).get("text", "")
+            language_code = request.get("voice", {}).get("languageCode", "")
+            audio_encoding = request.get("audioConfig", {}).get("audioEncoding")
+            try:
+                audio_content = synthesize_tone(text, language_code, audio_encoding)
+            except ValueError as e:
+                self._send_json(400, {"error": {"code": 400, "message": str(e),
+                                                "status": "INVALID_ARGUMENT"}})
+                return
+            self._send_json(200, {"audioContent": base64.b64encode(audio_content).decode()})
+        finally:
+            with self.stats_lock:
+                self.stats["active"] -= 1
+
+    def log_message(self, format, *args):
+        pass
+
+def create_server(host="127.0.0.1", port=8090, latency_ms=0.0, failure_rate=0.0,
+                  slow_rate=0.0, slow_ms=0.0):
+    """Fake TTS server, not yet serving (port 0 picks a free port)"""
+    handler = type("Handler", (FakeTTSHandler,), {
+        "latency": latency_ms / 1000.0,
+        "failure_rate": failure_rate,
+        "slow_rate": slow_rate,
+        "slow_latency": slow_ms / 1000.0,
+        "stats": {"requests": 0, "active": 0, "peak_concurrency": 0},
+    })
+    server = ThreadingHTTPServer((host, port), handler)
+    server.daemon_threads = True
+    return server
+
+def run_server(host="127.0.0.1", port=8090, latency_ms=0.0, failure_rate=0.0, slow_rate=0.0, slow_ms=0.0):
+    """Start the fake TTS server and block until interrupted"""
+    server = create_server(host, port, latency_ms, failure_rate, slow_rate, slow_ms)
+    print(f"🔈 Fake TTS server listening on http://{host}:{port}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Fake Google Cloud TTS server for local testing")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8090)
+    parser.add_argument("--latency-ms", type=float, default=0.0, help="Delay added to every request")
+    parser.add_argument("--failure-rate", type=float, default=0.0, help="Fraction of requests answered with 503")
+    parser.add_argument("--slow-rate", type=float, default=0.0, help="Fraction of requests delayed by --slow-ms")
+    parser.add_argument("--slow-ms", type=float, default=0.0, help="Extra delay for slow requests")
+    args = parser.parse_args(argv)
+    run_server(args.host, args.port, args.latency_ms, args.failure_rate, args.slow_rate, args.slow_ms)
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,155 @@
+# load_test_tts.py - Latency of the speak path under concurrent clicks
+"""
+Simulates users clicking speak buttons at the same time against one process
+wide TTS pool, the way the app shares it between sessions, and reports
+latency percentiles for the first chunk (when playback starts) and for the
+whole text. Every click uses new text so nothing is answered from the cache.
+
+By default it starts fake_tts_server.py in-process and points the Google
+engine at it, so no credentials or network are needed:
+
+    python load_test_tts.py --users 16 --clicks 5 --latency-ms 300
+    python load_test_tts.py --slow-rate 0.05 --slow-ms 8000 --fallback espeak --fallback-timeout 2
+    python load_test_tts.py --engine espeak
+    python load_test_tts.py --engine google --endpoint ""   # real Google Cloud TTS
+"""
+import argparse
+import os
+import statistics
+import sys
+import threading
+import time
+
+SRC_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "src")
+
+SENTENCES = [
+    "Habari ya asubuhi, karibu kwenye mkutano wa leo.",
+    "Tutajadili mpango wa kazi wa mwezi ujao na bajeti yake.",
+    "Please send the minutes to everyone before Friday.",
+    "Mvua imenyesha sana usiku wa jana katika maeneo mengi.",
+]
+
+def click_text(user, click, sentences):
+    """Distinct text per click, so every click is a cache miss"""
+    return " ".join(f"{SENTENCES[(user + i) % len(SENTENCES)]} ({user}-{click}-{i})" for i in range(sentences))
+
+def percentile(values, fraction):
+    values = sorted(values)
+    return values[min(len(values) - 1, int(round(fraction * (len(values) - 1))))]
+
+def start_fake_server(args):
+    """Run fake_tts_server.py on a free port in a background thread; returns (server, endpoint)"""
+    from fake_tts_server import create_server
+    server = create_server("127.0.0.1", 0, args.latency_ms, args.failure_rate, args.slow_rate, args.slow_ms)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, f"http://127.0.0.1:{server.server_address[1]}"
+
+def run_load_test(pool, users, clicks, sentences, language, gender):
+    """Every user clicks `clicks` times in a row; returns per-click timings"""
+    results = []
+    lock = threading.Lock()
+    start_barrier = threading.Barrier(users)
+
+    def user_session(user):
+        start_barrier.wait()
+        for click in range(clicks):
+            start = time.perf_counter()
+            futures = pool.submit_chunks(click_text(user, click, sentences), language, gender)
+            result = {"engines": set()}
+            try:
+                result["engines"].add(futures[0].result()["engine"])
+                result["first"] = time.perf_counter() - start
+                for future in futures[1:]:
+                    result["engines"].add(future.result()["engine"])
+                result["total"] = time.perf_counter() - start
+            except Exception as e:
+                result["error"] = f"{type(e).__name__}: {str(e)[:80]}"
+            with lock:
+                results.append(result)
+
+    threads = [threading.Thread(target=user_session, args=(user,)) for user in range(users)]
+    wall_start = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return results, time.perf_counter() - wall_start
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="TTS speak-path load test")
+    parser.add_argument("--engine", choices=["google", "espeak"], default="google")
+    parser.add_argument("--endpoint", default=None,
+                        help="Google engine endpoint; default starts a fake server, \"\" uses Google")
+    parser.add_argument("--fallback", choices=["google", "espeak"], default=None)
+    parser.add_argument("--fallback-timeout", type=float, default=None, help="Seconds before the fallback answers")
+    parser.add_argument("--users", type=int, default=8, help="Concurrent users")
+    parser.add_argument("--clicks", type=int, default=5, help="Clicks per user")
+    parser.add_argument("--sentences", type=int, default=3, help="Sentences per spoken text")
+    parser.add_argument("--concurrency", type=int, default=None, help="Pool size (KASUKU_TTS_CONCURRENCY)")
+    parser.add_argument("--language", choices=["sw", "en"], default="sw")
+    parser.add_argument("--gender", choices=["Female", "Male"], default="Female")
+    parser.add_argument("--latency-ms", type=float, default=200.0, help="Fake server latency")
+    parser.add_argument("--failure-rate", type=float, default=0.0, help="Fake server 503 rate")
+    parser.add_argument("--slow-rate", type=float, default=0.0, help="Fake server slow request rate")
+    parser.add_argument("--slow-ms", type=float, default=0.0, help="Fake server slow request delay")
+    args = parser.parse_args(argv)
+
+    sys.path.insert(0, SRC_DIR)
+    sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+    import backend
+
+    fake_server, endpoint = None, args.endpoint
+    if args.engine == "google" and endpoint is None:
+        fake_server, endpoint = start_fake_server(args)
+
+    def make_engine(name):
+        if name == "google":
+            return backend.GoogleTTSEngine(endpoint=endpoint, max_clients=args.concurrency)
+        return backend.create_tts_engine(name)
+
+    pool = backend.TTSClientPool(
+        engine=make_engine(args.engine),
+        fallback=make_engine(args.fallback) if args.fallback else None,
+        max_concurrency=args.concurrency,
+        cache=backend.TTSAudioCache(cache_dir=None),
+        fallback_timeout=args.fallback_timeout,
+    )
+    target = f"fake server at {endpoint}" if fake_server else endpoint or args.engine
+    print(f"\n📊 {args.users} users x {args.clicks} clicks, {args.sentences} sentences each, "
+          f"pool of {pool.max_concurrency} on {target}\n")
+
+    try:
+        results, wall_seconds = run_load_test(pool, args.users, args.clicks, args.sentences,
+                                              args.language, args.gender)
+    finally:
+        pool.close()
+        if fake_server:
+            fake_server.shutdown()
+
+    ok = [result for result in results if "error" not in result]
+    errors = [result["error"] for result in results if "error" in result]
+    print(f"{'':<14}{'p50 s':>10}{'p95 s':>10}{'p99 s':>10}{'max s':>10}")
+    print("-" * 54)
+    for label, key in (("first audio", "first"), ("whole text", "total")):
+        values = [result[key] for result in ok]
+        if values:
+            print(f"{label:<14}{statistics.median(values):>10.3f}{percentile(values, 0.95):>10.3f}"
+                  f"{percentile(values, 0.99):>10.3f}{max(values):>10.3f}")
+
+    print(f"\n{len(ok)}/{len(results)} clicks succeeded in {wall_seconds:.1f}s "
+          f"({len(results) / wall_seconds:.1f} clicks/s)")
+    for error in sorted(set(errors)):
+        print(f"⚠️  {errors.count(error)}x {error}")
+
+    stats = pool.stats()
+    served_by = {}
+    for result in ok:
+        for engine in result["engines"]:
+            served_by[engine] = served_by.get(engine, 0) + 1
+    print(f"chunks requested {stats['requests']}, synthesized {stats['synthesized']}, "
+          f"errors {stats['errors']}, fallbacks {stats['fallbacks']}")
+    print(f"clicks served by: {', '.join(f'{name} {count}' for name, count in served_by.items()) or 'none'}")
+    return 0 if not errors else 1
+
+if __name__ == "__main__":
+    sys.exit(main())
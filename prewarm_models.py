@@ -1,53 +1,159 @@
-# prewarm_models.py - More robust with progress tracking
+# prewarm_models.py - Download the models and write ready-to-load artifacts
+"""
+Runs at image build time. For each checkpoint it:
+  1. downloads the processor and model into the Hugging Face cache, using the
+     same Whisper classes the app loads, and
+  2. writes a pre-converted artifact (safetensors in the target dtype plus the
+     processor files) that backend memory-maps at startup instead of going
+     through the full from_pretrained conversion.
+
+Usage:
+    python prewarm_models.py                  # fp32 artifacts (CPU fp32/int8 and GPU)
+    python prewarm_models.py --dtypes fp32 bf16
+    python prewarm_models.py --skip-artifacts # download only
+    python prewarm_models.py --warmup         # then load and warm the models, report timings
+
+--warmup runs the same warm-up the app does at startup with KASUKU_WARMUP=1,
+locally and without a model server, and prints its timings.
+"""
+import argparse
+import json
 import os
+import shutil
 import sys
 import time
+from pathlib import Path
+
+MODEL_NAMES = {
+    "sw": "smainye/whisper-small-kenyan-swahili-nonstandard",
+    "en": "smainye/whisper-small-kenyan-english-nonstandard",
+}
+
+# Must match backend.model_artifact_path()
+MODEL_ARTIFACT_DIR = Path(os.getenv("KASUKU_ARTIFACT_DIR", Path.home() / ".cache" / "kasuku" / "artifacts"))
+ARTIFACT_MANIFEST = "kasuku_artifact.json"
+
+def artifact_path(model_name, dtype):
+    return MODEL_ARTIFACT_DIR / f"{model_name.replace('/', '--')}--{dtype}"
+
+def write_artifact(model_name, dtype, force=False):
+    """Save one checkpoint as safetensors in `dtype`, skipping finished artifacts"""
+    import torch
+    import transformers
+    from transformers import WhisperProcessor, WhisperForConditionalGeneration
 
-def prewarm_essential():
+    output_dir = artifact_path(model_name, dtype)
+    if (output_dir / ARTIFACT_MANIFEST).exists() and not force:
+        print(f"   ✅ {dtype} artifact already at {output_dir}")
+        return output_dir
+
+    torch_dtype = {"fp32": torch.float32, "fp16": torch.float16, "bf16": torch.bfloat16}[dtype]
+    start_time = time.time()
+    processor = WhisperProcessor.from_pretrained(model_name)
+    model = WhisperForConditionalGeneration.from_pretrained(model_name, torch_dtype=torch_dtype)
+
+    # Write next to the final folder and rename, so a failed build never
+    # leaves a half-written artifact that the app would try to load
+    tmp_dir = output_dir.with_name(output_dir.name + ".tmp")
+    shutil.rmtree(tmp_dir, ignore_errors=True)
+    model.save_pretrained(tmp_dir, safe_serialization=True)
+    processor.save_pretrained(tmp_dir)
+    manifest = {
+        "model": model_name,
+        "dtype": dtype,
+        "revision": getattr(model.config, "_commit_hash", None),
+        "transformers": transformers.__version__,
+        "created": time.strftime("%Y-%m-%dT%H:%M:%S"),
+    }
+    with open(tmp_dir / ARTIFACT_MANIFEST, "w") as f:
+        json.dump(manifest, f, indent=2)
+
+    shutil.rmtree(output_dir, ignore_errors=True)
+    os.replace(tmp_dir, output_dir)
+    del model, processor
+    print(f"   ✅ {dtype} artifact written to {output_dir} in {time.time() - start_time:.1f}s")
+    return output_dir
+
+def prewarm_essential(dtypes=("fp32",), skip_artifacts=False, force=False):
     """Download essential models with better error handling"""
     print("🚀 Pre-warming Hugging Face models...")
-    
+
     # Add timeout for downloads
     import socket
     socket.setdefaulttimeout(300)  # 5 minute timeout
-    
+
+    ok = True
     try:
-        from transformers import AutoModel, AutoTokenizer
-        
-        model_names = [
-            "smainye/whisper-small-kenyan-swahili-nonstandard",
-            "smainye/whisper-small-kenyan-english-nonstandard"
-        ]
+        from transformers import WhisperProcessor, WhisperForConditionalGeneration
+
+        model_names = list(MODEL_NAMES.values())
 
         for i, model_name in enumerate(model_names, 1):
             print(f"\n📥 [{i}/{len(model_names)}] Downloading: {model_name}")
-            
+
             try:
                 # Download with progress indication
                 start_time = time.time()
-                
-                # Tokenizer first (usually smaller)
-                tokenizer = AutoTokenizer.from_pretrained(model_name)
-                print(f"   ✅ Tokenizer downloaded")
-                
+
+                # Processor first (usually smaller)
+                processor = WhisperProcessor.from_pretrained(model_name)
+                print(f"   ✅ Processor downloaded")
+
                 # Model with cleanup
-                model = AutoModel.from_pretrained(model_name)
+                model = WhisperForConditionalGeneration.from_pretrained(model_name)
                 print(f"   ✅ Model downloaded")
-                
+
                 # Clean up memory
-                del model, tokenizer
-                
+                del model, processor
+
                 download_time = time.time() - start_time
                 print(f"   ⏱️  Download completed in {download_time:.1f}s")
-                
+
+                if not skip_artifacts:
+                    for dtype in dtypes:
+                        write_artifact(model_name, dtype, force=force)
+
             except Exception as e:
-                print(f"   ⚠️  Failed to download {model_name}: {str(e)[:100]}...")
+                print(f"   ⚠️  Failed to prepare {model_name}: {str(e)[:100]}...")
+                ok = False
                 # Continue with next model
 
     except Exception as e:
         print(f"❌ Error in pre-warming: {e}")
-    
+        ok = False
+
     print("\n✅ Model pre-warming complete.")
+    return ok
+
+def report_warmup():
+    """Warm the models with backend's startup routine and print the timings"""
+    sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "src"))
+    os.environ.pop("KASUKU_MODEL_SERVER_URL", None)
+    import backend
+
+    print("\n🔥 Warming up models...")
+    readiness = backend.warm_up_models(manager=backend.ModelManager())
+    for language, info in readiness["models"].items():
+        print(f"\n   {backend.MODEL_NAMES[language]}: {info['state']}")
+        if info["state"] != "ready":
+            print(f"   ⚠️  {info.get('error', '')}")
+            continue
+        print(f"   load {info['load_seconds']:.2f}s")
+        for seconds, cold in info["cold"].items():
+            print(f"   {seconds:>4}s clip: first {cold:.2f}s, warm {info['warm'][seconds]:.2f}s")
+    return readiness["state"] == "ready"
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Download Kasuku models and build load-ready artifacts")
+    parser.add_argument("--dtypes", nargs="+", default=["fp32"], choices=["fp32", "fp16", "bf16"],
+                        help="Artifact dtypes to write (fp32 serves GPU, CPU fp32 and CPU int8)")
+    parser.add_argument("--skip-artifacts", action="store_true", help="Only populate the Hugging Face cache")
+    parser.add_argument("--force", action="store_true", help="Rewrite artifacts that already exist")
+    parser.add_argument("--warmup", action="store_true", help="Load and warm the models afterwards and report timings")
+    args = parser.parse_args(argv)
+    prewarm_essential(args.dtypes, args.skip_artifacts, args.force)
+    if args.warmup:
+        report_warmup()
 
 if __name__ == "__main__":
-    prewarm_essential()
\ No newline at end of file
+    main()
@@ -0,0 +1,104 @@
+# profile_startup.py - Report what importing the app costs before the login page renders
+"""
+Imports the app modules in a fresh interpreter with `python -X importtime`
+and reports import time per top-level package, the slowest individual
+modules, and whether any heavy dependency (torch, transformers, librosa,
+Google Cloud TTS) was pulled in at import time. Those are meant to load on
+first use only.
+
+Usage:
+    python profile_startup.py
+    python profile_startup.py --modules backend --top 20
+    python profile_startup.py --budget-ms 1000   # non-zero exit if over budget
+"""
+import argparse
+import os
+import subprocess
+import sys
+from collections import defaultdict
+
+SRC_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "src")
+
+# Must stay out of the import path of the login page
+HEAVY_MODULES = ["torch", "transformers", "librosa", "scipy", "google.cloud.texttospeech"]
+
+def profile_imports(modules):
+    """Import `modules` under -X importtime; return [(module, self_us, cumulative_us)] and wall time"""
+    code = (
+        "import sys, time\n"
+        "start = time.perf_counter()\n"
+        f"for name in {modules!r}:\n"
+        "    __import__(name)\n"
+        "print('WALL', time.perf_counter() - start)\n"
+        f"print('LOADED', ','.join(m for m in {HEAVY_MODULES!r} if m in sys.modules))\n"
+    )
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", code],
+        cwd=SRC_DIR, capture_output=True, text=True
+    )
+    if result.returncode != 0:
+        raise RuntimeError(result.stderr.strip().splitlines()[-1])
+
+    entries = []
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|")
+        entries.append((name.strip(), int(self_us), int(cumulative_us)))
+
+    wall_seconds, loaded = 0.0, []
+    for line in result.stdout.splitlines():
+        if line.startswith("WALL "):
+            wall_seconds = float(line.split()[1])
+        elif line.startswith("LOADED "):
+            loaded = [m for m in line.split(" ", 1)[1].split(",") if m]
+    return entries, wall_seconds, loaded
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Startup import profiler")
+    parser.add_argument("--modules", nargs="+", default=["backend", "frontend"],
+                        help="App modules to import (from src/)")
+    parser.add_argument("--top", type=int, default=15, help="Rows to show in each table")
+    parser.add_argument("--budget-ms", type=float, default=None,
+                        help="Fail if importing the app modules takes longer than this")
+    args = parser.parse_args(argv)
+
+    try:
+        entries, wall_seconds, loaded = profile_imports(args.modules)
+    except RuntimeError as e:
+        print(f"❌ Import failed: {e}")
+        return 1
+
+    by_package = defaultdict(int)
+    for name, self_us, _ in entries:
+        by_package[name.split(".")[0]] += self_us
+
+    print(f"\n📊 Importing {', '.join(args.modules)}: {wall_seconds * 1000:.0f} ms wall\n")
+    print(f"{'package':<32}{'self ms':>10}")
+    print("-" * 42)
+    for package, self_us in sorted(by_package.items(), key=lambda item: -item[1])[:args.top]:
+        print(f"{package:<32}{self_us / 1000:>10.1f}")
+
+    print(f"\n{'module':<48}{'self ms':>10}{'cumulative ms':>15}")
+    print("-" * 73)
+    for name, self_us, cumulative_us in sorted(entries, key=lambda entry: -entry[1])[:args.top]:
+        print(f"{name:<48}{self_us / 1000:>10.1f}{cumulative_us / 1000:>15.1f}")
+
+    # Streamlit is already imported by the time `streamlit run` executes the app
+    streamlit_ms = by_package.get("streamlit", 0) / 1000
+    print(f"\nWithout streamlit itself: {wall_seconds * 1000 - streamlit_ms:.0f} ms")
+
+    ok = True
+    if loaded:
+        print(f"⚠️  Heavy modules imported at startup: {', '.join(loaded)}")
+        ok = False
+    else:
+        print("✅ No heavy modules imported at startup")
+
+    if args.budget_ms is not None and wall_seconds * 1000 > args.budget_ms:
+        print(f"⚠️  Over the {args.budget_ms:.0f} ms startup budget")
+        ok = False
+    return 0 if ok else 1
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,14 +1,14 @@
 import streamlit as st
-import librosa
-import io
 
 # Import from our modules
 from backend import (
     load_swahili_model, 
     load_english_model, 
-    preprocess_audio, 
+    preload_models,
+    start_warmup,
+    get_readiness,
     transcribe_audio,
-    process_recorded_audio,
+    ingest_recorded_audio,
     create_transcription_item
 )
 from frontend import (
@@ -16,6 +16,7 @@ from frontend import (
     login_page,
     render_sidebar,
     render_main_interface,
+    render_live_transcription,
     render_transcription_result,
     render_history_grid
 )
@@ -31,8 +32,6 @@ def initialize_session_state():
     """Initialize session state variables"""
     if 'authenticated' not in st.session_state:
         st.session_state.authenticated = False
-    if 'transcription_history' not in st.session_state:
-        st.session_state.transcription_history = []
     if 'show_success_message' not in st.session_state:
         st.session_state.show_success_message = False
     if 'success_message' not in st.session_state:
@@ -53,6 +52,8 @@ def initialize_session_state():
     # --- NEW SESSION STATE VARIABLE ---
     if 'tts_voice_gender' not in st.session_state:
         st.session_state.tts_voice_gender = 'Female' # Default gender
+    if 'live_transcriber' not in st.session_state:
+        st.session_state.live_transcriber = None
     # ----------------------------------
     
 
@@ -77,10 +78,18 @@ def main_app():
     else:
         processor, model, device = load_english_model()
     
-    if processor is None or model is None:
+    if model is None:
         st.error("Failed to load model. Please try again.")
         return
     
+    if get_readiness()["models"].get(language_code, {}).get("state") == "warming":
+        st.caption("⏳ Warming up the model. The first transcription may take a little longer.")
+    
+    # Warm the other language's model in the background once per login
+    if not st.session_state.get('models_preloaded'):
+        preload_models(exclude=language_code)
+        st.session_state.models_preloaded = True
+    
     # Check if we should show welcome message
     show_welcome = st.session_state.get('show_welcome', True)
     
@@ -89,10 +98,18 @@ def main_app():
     
     # Main recording interface
     with col2:
-        recorded_audio = st.audio_input(f"Record yourself in {selected_language}",
-                                        help="Click on the microphone button to start recording",
-                                        label_visibility="visible", 
-                                        width="stretch")
+        live_captions = st.toggle("Live captions",
+                                  key="live_captions",
+                                  help="See the transcription while you speak")
+        
+        if live_captions:
+            render_live_transcription(processor, model, device, language_code, selected_language)
+            recorded_audio = None
+        else:
+            recorded_audio = st.audio_input(f"Record yourself in {selected_language}",
+                                            help="Click on the microphone button to start recording",
+                                            label_visibility="visible", 
+                                            width="stretch")
         
         audio_data = None
         sample_rate = None
@@ -101,22 +118,22 @@ def main_app():
             # Hide welcome message when recording starts
             st.session_state.show_welcome = False
             
+            # Decoded once per recording; reruns reuse the cached 16 kHz array
+            audio_digest, audio_data, sample_rate = ingest_recorded_audio(recorded_audio)
+            
             # Only clear current transcription if it's a new recording
             # (This prevents clearing when just interacting with buttons)
-            if 'current_audio_bytes' not in st.session_state:
-                st.session_state.current_audio_bytes = None
+            if 'current_audio_digest' not in st.session_state:
+                st.session_state.current_audio_digest = None
             
-            current_audio_bytes = recorded_audio.getvalue()
-            if current_audio_bytes != st.session_state.current_audio_bytes:
+            if audio_digest != st.session_state.current_audio_digest:
                 # New recording - clear previous transcription
                 st.session_state.current_transcription = None
                 st.session_state.current_transcription_language = None
-                st.session_state.current_audio_bytes = current_audio_bytes
-            
-            audio_data, sample_rate = process_recorded_audio(recorded_audio)
+                st.session_state.current_audio_digest = audio_digest
         else:
-            # No audio recorded - clear the stored audio bytes
-            st.session_state.current_audio_bytes = None
+            # No audio recorded - clear the stored audio digest
+            st.session_state.current_audio_digest = None
         
         # Transcribe button
         if audio_data is not None:
@@ -125,19 +142,17 @@ def main_app():
                         icon=":material/speech_to_text:", 
                         key="transcribe_button"):
                 with st.spinner(f"Transcribing {selected_language} audio... Please wait."):
-                    processed_audio, processed_sr = preprocess_audio(audio_data, sample_rate)
+                    # audio_data is already resampled to 16 kHz and normalized
+                    transcription = transcribe_audio(
+                        processor, model, device, audio_data, language_code
+                    )
                     
-                    if processed_audio is not None:
-                        transcription = transcribe_audio(
-                            processor, model, device, processed_audio, language_code
-                        )
-                        
-                        if transcription:
-                            # Store current transcription in session state
-                            st.session_state.current_transcription = transcription
-                            st.session_state.current_transcription_language = selected_language
-                            # Clear the show_welcome flag after successful transcription
-                            st.session_state.show_welcome = False
+                    if transcription:
+                        # Store current transcription in session state
+                        st.session_state.current_transcription = transcription
+                        st.session_state.current_transcription_language = selected_language
+                        # Clear the show_welcome flag after successful transcription
+                        st.session_state.show_welcome = False
     
     # Show current transcription result if it exists
     if st.session_state.get('current_transcription'):
@@ -161,6 +176,9 @@ def main():
         login_page()
     else:
         main_app()
+    
+    # Warm the models once per process, after the page has rendered
+    start_warmup()
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
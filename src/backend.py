@@ -1,18 +1,41 @@
 import streamlit as st
-import torch
-from transformers import WhisperProcessor, WhisperForConditionalGeneration
-import librosa
 import numpy as np
 import io
 import hashlib
 import datetime
 import uuid
+import weakref
 import base64
 from pathlib import Path
 import tempfile
 import os
 import json
 import atexit
+import functools
+import gc
+import importlib.util
+import queue
+import re
+import threading
+import time
+from concurrent.futures import Future
+
+class _LazyModule:
+    """
+    Stand-in for a heavy module that is only imported on first attribute
+    access, so importing backend (and rendering the login page) doesn't
+    pay for the ML stack.
+    """
+    
+    def __init__(self, name):
+        self._name = name
+    
+    def __getattr__(self, attr):
+        return getattr(importlib.import_module(self._name), attr)
+
+torch = _LazyModule("torch")
+transformers = _LazyModule("transformers")
+librosa = _LazyModule("librosa")
 
 def load_environment_variables():
     """
@@ -200,50 +223,597 @@ def authenticate_user(identifier: str, password: str):
 
     return False, None
 
-@st.cache_resource  
-def load_swahili_model():
-    """Load the Swahili fine-tuned Whisper model with caching"""
+def history_owner(identifier):
+    """Partition key of a user's saved history: their email, also when they signed in by phone"""
+    identifier = (identifier or "").strip()
+    for email, user in DEMO_USERS.items():
+        if user.get("phone") and identifier == user["phone"]:
+            return email
+    return identifier
+
+# Hugging Face checkpoints for each supported language
+MODEL_NAMES = {
+    "sw": "smainye/whisper-small-kenyan-swahili-nonstandard",
+    "en": "smainye/whisper-small-kenyan-english-nonstandard",
+}
+
+# When set (e.g. http://127.0.0.1:8765), transcription is delegated to a
+# shared model server (see model_server.py) instead of loading weights here
+MODEL_SERVER_URL = os.getenv("KASUKU_MODEL_SERVER_URL", "").rstrip("/")
+MODEL_SERVER_TIMEOUT = float(os.getenv("KASUKU_MODEL_SERVER_TIMEOUT", "600"))
+
+# Precision used when no GPU is available: "fp32", "int8" (dynamic
+# quantization of the Linear layers) or "bf16" (where the CPU supports it)
+CPU_PRECISION = os.getenv("KASUKU_CPU_PRECISION", "fp32").lower()
+
+def _cpu_supports_bf16():
+    """Check whether oneDNN has native bf16 kernels on this CPU"""
     try:
-        model_name = "smainye/whisper-small-kenyan-swahili-nonstandard"
+        return bool(torch.ops.mkldnn._is_mkldnn_bf16_supported())
+    except Exception:
+        return False
+
+def _apply_cpu_precision(model, precision):
+    """Convert a CPU model to the requested inference precision"""
+    if precision == "int8":
+        return torch.ao.quantization.quantize_dynamic(
+            model, {torch.nn.Linear}, dtype=torch.qint8
+        )
+    if precision == "bf16":
+        if _cpu_supports_bf16():
+            return model.to(torch.bfloat16)
+        print("Warning: bf16 is not supported on this CPU, using fp32")
+    elif precision != "fp32":
+        print(f"Warning: Unknown CPU precision '{precision}', using fp32")
+    return model
+
+# Inference engine that runs the models: "transformers" (PyTorch generate)
+# or "onnx" (ONNX Runtime encoder + decoder-with-past, see export_onnx.py)
+INFERENCE_ENGINE = os.getenv("KASUKU_ENGINE", "transformers").lower()
+
+# Where export_onnx.py writes the exported models (one folder per checkpoint)
+ONNX_EXPORT_DIR = Path(os.getenv("KASUKU_ONNX_DIR", Path.home() / ".cache" / "kasuku" / "onnx"))
+
+def onnx_export_path(model_name):
+    """Folder holding the ONNX export of a Hugging Face checkpoint"""
+    return ONNX_EXPORT_DIR / model_name.replace("/", "--")
+
+# Ready-to-load safetensors written at build time by prewarm_models.py
+# (one folder per checkpoint and dtype). Used instead of the Hugging Face
+# snapshot when present; set KASUKU_USE_ARTIFACTS=0 to ignore them.
+MODEL_ARTIFACT_DIR = Path(os.getenv("KASUKU_ARTIFACT_DIR", Path.home() / ".cache" / "kasuku" / "artifacts"))
+USE_MODEL_ARTIFACTS = os.getenv("KASUKU_USE_ARTIFACTS", "1") == "1"
+ARTIFACT_MANIFEST = "kasuku_artifact.json"
+
+ARTIFACT_DTYPES = {
+    "fp32": "float32",
+    "fp16": "float16",
+    "bf16": "bfloat16",
+}
+
+def model_artifact_path(model_name, dtype="fp32"):
+    """Folder holding the pre-converted artifact of a checkpoint in one dtype"""
+    return MODEL_ARTIFACT_DIR / f"{model_name.replace('/', '--')}--{dtype}"
+
+def _artifact_dtype(precision, device):
+    """Weight dtype the loaded model ends up in (int8 is quantized from fp32 at load)"""
+    return "bf16" if device == "cpu" and precision == "bf16" and _cpu_supports_bf16() else "fp32"
+
+def _find_model_artifact(model_name, dtype):
+    """Artifact folder for a checkpoint, or None if it wasn't built (or is incomplete)"""
+    if not USE_MODEL_ARTIFACTS:
+        return None
+    path = model_artifact_path(model_name, dtype)
+    # The manifest is written last, so its presence means the export finished
+    return path if (path / ARTIFACT_MANIFEST).exists() else None
+
+def _load_transformers_engine(model_name, precision, device):
+    """
+    Load the PyTorch model used by transformers generate(). Pre-converted
+    artifacts are memory-mapped straight into a model built without random
+    initialization; otherwise the Hugging Face checkpoint is loaded.
+    """
+    dtype = _artifact_dtype(precision, device)
+    artifact = _find_model_artifact(model_name, dtype)
+    
+    if artifact is not None:
+        load_kwargs = {"torch_dtype": getattr(torch, ARTIFACT_DTYPES[dtype]), "use_safetensors": True}
+        # Skips the throwaway weight initialization (needs accelerate)
+        if importlib.util.find_spec("accelerate") is not None:
+            load_kwargs["low_cpu_mem_usage"] = True
+        processor = transformers.WhisperProcessor.from_pretrained(artifact)
+        model = transformers.WhisperForConditionalGeneration.from_pretrained(artifact, **load_kwargs)
+    else:
+        processor = transformers.WhisperProcessor.from_pretrained(model_name)
+        model = transformers.WhisperForConditionalGeneration.from_pretrained(model_name)
+    model.eval()
+    
+    if device == "cpu":
+        model = _apply_cpu_precision(model, precision)
+    else:
+        model = model.to(device)
+    
+    return processor, model, device
+
+def _load_onnx_engine(model_name, precision, device):
+    """Load the ONNX Runtime model, exporting it on the fly if export_onnx.py has not run"""
+    from optimum.onnxruntime import ORTModelForSpeechSeq2Seq
+    
+    if precision != "fp32":
+        print(f"Warning: CPU precision '{precision}' is ignored by the ONNX engine")
+    
+    export_path = onnx_export_path(model_name)
+    exported = (export_path / "encoder_model.onnx").exists()
+    if not exported:
+        print(f"Warning: No ONNX export found at {export_path}, exporting {model_name} now")
+    
+    source = str(export_path) if exported else model_name
+    provider = "CUDAExecutionProvider" if device == "cuda" else "CPUExecutionProvider"
+    processor = transformers.WhisperProcessor.from_pretrained(source)
+    model = ORTModelForSpeechSeq2Seq.from_pretrained(
+        source, export=not exported, use_cache=True, provider=provider
+    )
+    
+    return processor, model, device
+
+# Engine name -> loader(model_name, precision, device) returning (processor, model, device).
+# Every engine's model must expose a transformers-compatible generate().
+INFERENCE_ENGINES = {
+    "transformers": _load_transformers_engine,
+    "onnx": _load_onnx_engine,
+}
+
+def _load_whisper_model(model_name, precision=None, device=None, engine=None):
+    """Load a Whisper processor and model with the configured engine on the best device"""
+    engine = engine or INFERENCE_ENGINE
+    if engine not in INFERENCE_ENGINES:
+        raise ValueError(f"Unknown inference engine '{engine}', expected one of {sorted(INFERENCE_ENGINES)}")
+    
+    # Move to GPU if available
+    if device is None:
+        device = "cuda" if torch.cuda.is_available() else "cpu"
+    precision = precision or CPU_PRECISION
+    
+    processor, model, device = INFERENCE_ENGINES[engine](model_name, precision, device)
+    
+    # Recorded so cached transcriptions are never shared between model variants
+    model.kasuku_variant = f"{model_name}|{engine}|{precision if device == 'cpu' else device}"
+    return processor, model, device
+
+# Memory budget (MB) shared by all resident models; 0 means no limit.
+# When a load would exceed it, the least recently used models are unloaded.
+MODEL_MEMORY_BUDGET_MB = float(os.getenv("KASUKU_MODEL_MEMORY_BUDGET_MB", "0"))
+
+def model_memory_mb(model):
+    """Approximate memory held by a loaded model's weights, in MB"""
+    def tensor_bytes(value):
+        if isinstance(value, torch.Tensor):
+            return value.numel() * value.element_size()
+        if isinstance(value, (tuple, list)):
+            # Packed int8 Linear weights are stored as (weight, bias) tuples
+            return sum(tensor_bytes(v) for v in value)
+        return 0
+    
+    if isinstance(model, torch.nn.Module):
+        return sum(tensor_bytes(v) for v in model.state_dict().values()) / (1024 * 1024)
+    
+    # ONNX Runtime models: size of the exported graphs on disk
+    save_dir = getattr(model, "model_save_dir", None)
+    if save_dir and Path(save_dir).is_dir():
+        return sum(f.stat().st_size for f in Path(save_dir).glob("*.onnx*")) / (1024 * 1024)
+    return 0.0
+
+class ModelManager:
+    """
+    Owns every Whisper model in the process. Models are loaded on first use,
+    kept within a shared memory budget by unloading the least recently used
+    ones, and their residency and load times are reported by stats().
+    """
+    
+    def __init__(self, model_names=None, budget_mb=None, loader=None):
+        self.model_names = dict(MODEL_NAMES if model_names is None else model_names)
+        self.budget_mb = MODEL_MEMORY_BUDGET_MB if budget_mb is None else budget_mb
+        self._loader = loader or _load_whisper_model
+        self._models = {}   # language -> (processor, model, device), most recently used last
+        self._info = {}     # language -> residency and timing details
+        self._loading = set()  # languages with a load in progress
+        self._lock = threading.RLock()
+        self._load_lock = threading.Lock()
+    
+    def register(self, language, model_name):
+        """Add (or replace) the checkpoint served for a language"""
+        with self._lock:
+            if self.model_names.get(language) != model_name:
+                self.unload(language)
+            self.model_names[language] = model_name
+    
+    def is_loaded(self, language):
+        with self._lock:
+            return language in self._models
+    
+    def loaded(self):
+        with self._lock:
+            return list(self._models)
+    
+    def resident_mb(self):
+        with self._lock:
+            return sum(self._info[language]["size_mb"] for language in self._models)
+    
+    def is_loading(self, language):
+        with self._lock:
+            return language in self._loading
+    
+    def _touch(self, language):
+        """Mark a resident model as used and return it (caller holds the lock)"""
+        # Move to the most recently used end
+        self._models[language] = self._models.pop(language)
+        info = self._info[language]
+        info["last_used"] = time.time()
+        info["hits"] += 1
+        return self._models[language]
+    
+    def _expected_mb(self, language):
+        """Size seen last time this model was loaded, else the largest resident model"""
+        return self._info.get(language, {}).get("size_mb") or max(
+            (self._info[other]["size_mb"] for other in self._models), default=0.0
+        )
+    
+    def get(self, language, touch=True):
+        """
+        Return (processor, model, device) for a language, loading it if needed.
+        If the model is already being loaded (e.g. by preload()), waits for
+        that load instead of starting another one.
+        """
+        if language not in self.model_names:
+            raise ValueError(f"Unsupported language: {language}")
         
-        with st.spinner("Loading Swahili Whisper model..."):
-            processor = WhisperProcessor.from_pretrained(model_name)
-            model = WhisperForConditionalGeneration.from_pretrained(model_name)
+        with self._lock:
+            if language in self._models:
+                return self._touch(language) if touch else self._models[language]
+        
+        # One load at a time keeps peak memory within the budget; resident
+        # models stay available to other sessions meanwhile
+        with self._load_lock:
+            with self._lock:
+                if language in self._models:
+                    return self._touch(language) if touch else self._models[language]
+                self._evict_for(self._expected_mb(language))
+                self._loading.add(language)
             
-            # Move to GPU if available
-            device = "cuda" if torch.cuda.is_available() else "cpu"
-            model = model.to(device)
+            try:
+                start_time = time.time()
+                loaded = self._loader(self.model_names[language])
+                load_seconds = time.time() - start_time
+            finally:
+                with self._lock:
+                    self._loading.discard(language)
             
-        return processor, model, device
+            with self._lock:
+                if touch:
+                    self._models[language] = loaded
+                else:
+                    # Background loads start out least recently used
+                    self._models = {language: loaded, **self._models}
+                self._info[language] = {
+                    "model": self.model_names[language],
+                    "device": loaded[2],
+                    "size_mb": model_memory_mb(loaded[1]),
+                    "load_seconds": load_seconds,
+                    "loads": self._info.get(language, {}).get("loads", 0) + 1,
+                    "hits": 0,
+                    "last_used": time.time(),
+                }
+                print(f"Loaded {self.model_names[language]} in {load_seconds:.1f}s "
+                      f"({self._info[language]['size_mb']:.0f} MB)")
+                
+                # The real size is known now; trim again if the estimate was low
+                self._evict_for(0.0, keep=language)
+            return loaded
+    
+    def fits(self, language):
+        """Whether a model can be resident alongside the current ones within the budget"""
+        with self._lock:
+            if language in self._models or self.budget_mb <= 0:
+                return True
+            return self.resident_mb() + self._expected_mb(language) <= self.budget_mb
+    
+    def preload(self, language):
+        """
+        Load a model in a background thread if it fits in the budget without
+        unloading anything. Returns the thread, or None if nothing was started.
+        """
+        with self._lock:
+            if language in self._models or language in self._loading:
+                return None
+            if not self.fits(language):
+                print(f"Not preloading {self.model_names[language]}: it would not fit in "
+                      f"{self.budget_mb:.0f} MB")
+                return None
+            # Marked as loading right away so callers know to wait for it
+            self._loading.add(language)
+        
+        def run():
+            try:
+                self.get(language, touch=False)
+            except Exception as e:
+                print(f"Warning: Background load of {self.model_names[language]} failed: {str(e)}")
+            finally:
+                with self._lock:
+                    self._loading.discard(language)
+        
+        thread = threading.Thread(target=run, name=f"kasuku-preload-{language}", daemon=True)
+        thread.start()
+        return thread
+    
+    def _evict_for(self, incoming_mb, keep=None):
+        """Unload least recently used models until incoming_mb more fits in the budget"""
+        if self.budget_mb <= 0:
+            return
+        for language in list(self._models):
+            if self.resident_mb() + incoming_mb <= self.budget_mb:
+                return
+            if language != keep:
+                print(f"Unloading {self.model_names[language]} to stay within "
+                      f"{self.budget_mb:.0f} MB")
+                self.unload(language)
+    
+    def unload(self, language):
+        """Drop a model and its schedulers; memory is freed once in-flight calls finish"""
+        with self._lock:
+            loaded = self._models.pop(language, None)
+        if loaded is None:
+            return
+        
+        shutdown_batch_schedulers(model=loaded[1])
+        del loaded
+        gc.collect()
+        if torch.cuda.is_available():
+            torch.cuda.empty_cache()
+    
+    def stats(self):
+        """Residency, size and load time of every registered model"""
+        with self._lock:
+            return {
+                "budget_mb": self.budget_mb,
+                "resident_mb": round(self.resident_mb(), 1),
+                "models": {
+                    language: {
+                        "model": model_name,
+                        "resident": language in self._models,
+                        "loading": language in self._loading,
+                        **{k: (round(v, 2) if isinstance(v, float) else v)
+                           for k, v in self._info.get(language, {}).items() if k != "model"},
+                    }
+                    for language, model_name in self.model_names.items()
+                },
+            }
+
+@st.cache_resource
+def get_model_manager():
+    """Process-wide model manager shared by every session"""
+    return ModelManager()
+
+def load_model(language, label=None):
+    """
+    Return (processor, model, device) for a language from the shared model
+    manager, or a RemoteModel when a model server is configured.
+    """
+    if MODEL_SERVER_URL:
+        return None, RemoteModel(MODEL_SERVER_URL, language), "remote"
+    
+    manager = get_model_manager()
+    label = label or manager.model_names.get(language, language)
+    try:
+        if manager.is_loaded(language):
+            return manager.get(language)
+        # Blocks until a background preload of this model finishes, if one is running
+        message = "Finishing loading" if manager.is_loading(language) else "Loading"
+        with st.spinner(f"{message} {label} Whisper model..."):
+            return manager.get(language)
     except Exception as e:
-        st.error(f"Error loading Swahili model: {str(e)}")
+        st.error(f"Error loading {label} model: {str(e)}")
         return None, None, None
 
-@st.cache_resource  
+# Load the other languages' models in the background after login
+PRELOAD_MODELS = os.getenv("KASUKU_PRELOAD_MODELS", "1") == "1"
+
+def preload_models(exclude=None):
+    """
+    Start background loads of every registered model except `exclude`, as
+    far as the memory budget allows, so switching language doesn't stall.
+    """
+    if MODEL_SERVER_URL or not PRELOAD_MODELS:
+        return []
+    manager = get_model_manager()
+    threads = [manager.preload(language) for language in manager.model_names if language != exclude]
+    return [thread for thread in threads if thread is not None]
+
+def load_swahili_model():
+    """Load the Swahili fine-tuned Whisper model from the model manager"""
+    return load_model("sw", "Swahili")
+
 def load_english_model():
-    """Load the English Whisper model with caching"""
-    try:
-        model_name = "smainye/whisper-small-kenyan-english-nonstandard"
+    """Load the English Whisper model from the model manager"""
+    return load_model("en", "English")
+
+class RemoteModel:
+    """
+    Thin client for a model server process. Stands in for the model object
+    returned by the load_*_model functions when KASUKU_MODEL_SERVER_URL is set.
+    """
+
+    def __init__(self, url, language, timeout=MODEL_SERVER_TIMEOUT):
+        self.url = url
+        self.language = language
+        self.timeout = timeout
+
+    def transcribe(self, audio_data, language=None):
+        """Send 16 kHz float32 samples to the server and return the transcription"""
+        import urllib.error
+        import urllib.parse
+        import urllib.request
         
-        with st.spinner("Loading English Whisper model..."):
-            processor = WhisperProcessor.from_pretrained(model_name)
-            model = WhisperForConditionalGeneration.from_pretrained(model_name)
-            
-            # Move to GPU if available
-            device = "cuda" if torch.cuda.is_available() else "cpu"
-            model = model.to(device)
-            
-        return processor, model, device
-    except Exception as e:
-        st.error(f"Error loading English model: {str(e)}")
-        return None, None, None
+        query = urllib.parse.urlencode({"language": language or self.language})
+        request = urllib.request.Request(
+            f"{self.url}/transcribe?{query}",
+            data=np.ascontiguousarray(audio_data, dtype="<f4").tobytes(),
+            headers={"Content-Type": "application/octet-stream"},
+            method="POST"
+        )
+        try:
+            with urllib.request.urlopen(request, timeout=self.timeout) as response:
+                payload = json.loads(response.read().decode("utf-8"))
+        except urllib.error.HTTPError as e:
+            # Failures come back as an error status with a JSON {"error": ...} body
+            try:
+                message = json.loads(e.read().decode("utf-8")).get("error")
+            except (ValueError, AttributeError):
+                message = None
+            finally:
+                e.close()
+            raise RuntimeError(f"Model server error: {message or e}") from e
+        
+        if "error" in payload:
+            raise RuntimeError(f"Model server error: {payload['error']}")
+        return payload["transcription"]
+
+try:
+    import soxr
+    SOXR_AVAILABLE = True
+except ImportError:
+    SOXR_AVAILABLE = False
+
+def _rate_ratio(orig_sr, target_sr):
+    """Reduced (up, down) factors for converting orig_sr to target_sr"""
+    from math import gcd
+    orig_sr, target_sr = int(orig_sr), int(target_sr)
+    divisor = gcd(orig_sr, target_sr)
+    return target_sr // divisor, orig_sr // divisor
+
+@functools.lru_cache(maxsize=16)
+def _polyphase_filter(up, down):
+    """
+    Kaiser-windowed low-pass FIR for an up/down rate pair, designed once and
+    reused for every call (same design scipy's resample_poly uses by default).
+    """
+    from scipy.signal import firwin
+    max_rate = max(up, down)
+    half_len = 10 * max_rate
+    taps = firwin(2 * half_len + 1, 1.0 / max_rate, window=("kaiser", 5.0)).astype(np.float32)
+    taps.setflags(write=False)
+    return taps
+
+def resample_audio(audio_data, orig_sr, target_sr=16000):
+    """
+    Resample in float32. Uses libsoxr (installed with librosa) directly when
+    available, otherwise scipy's polyphase filter with a cached design.
+    """
+    audio_data = np.asarray(audio_data, dtype=np.float32)
+    if int(orig_sr) == int(target_sr):
+        return audio_data
+    
+    if SOXR_AVAILABLE:
+        return soxr.resample(audio_data, int(orig_sr), int(target_sr), quality="HQ")
+    
+    from scipy.signal import resample_poly
+    up, down = _rate_ratio(orig_sr, target_sr)
+    return resample_poly(audio_data, up, down, window=_polyphase_filter(up, down))
+
+class StreamResampler:
+    """
+    Block-wise version of resample_audio for audio that arrives in pieces.
+    
+    Concatenating the output of process() for every block followed by
+    flush() gives the same samples as resample_audio on the whole signal
+    (up to float rounding). Only the input still needed by the filter is
+    kept between blocks.
+    """
+
+    def __init__(self, orig_sr, target_sr=16000):
+        self.orig_sr = int(orig_sr)
+        self.target_sr = int(target_sr)
+        self.up, self.down = _rate_ratio(orig_sr, target_sr)
+        self._stream = None
+        if self.up == self.down == 1:
+            return
+        if SOXR_AVAILABLE:
+            self._stream = soxr.ResampleStream(
+                self.orig_sr, self.target_sr, 1, dtype="float32", quality="HQ"
+            )
+            return
+        
+        # Same filter layout as resample_poly: pre-padded so the output is aligned
+        taps = _polyphase_filter(self.up, self.down) * self.up
+        half_len = (len(taps) - 1) // 2
+        n_pre_pad = self.down - half_len % self.down
+        self._taps = np.concatenate([np.zeros(n_pre_pad, dtype=np.float32), taps])
+        self._skip = (half_len + n_pre_pad) // self.down  # leading outputs to drop
+        
+        self._history = np.zeros(0, dtype=np.float32)
+        self._history_start = 0  # input index of self._history[0]
+        self._consumed = 0       # input samples received so far
+        self._produced = 0       # filter outputs computed so far (including skipped ones)
+
+    def process(self, block):
+        """Resample the next block, returning every output sample that is now final"""
+        block = np.asarray(block, dtype=np.float32)
+        if self.up == self.down == 1:
+            return block.copy()
+        if self._stream is not None:
+            return self._stream.resample_chunk(block)
+        
+        self._history = np.concatenate([self._history, block])
+        self._consumed += len(block)
+        
+        # Output m only depends on inputs up to floor(m * down / up)
+        available = -(-self._consumed * self.up // self.down)
+        return self._emit(available)
+
+    def flush(self):
+        """Emit the filter tail once the stream has ended"""
+        if self.up == self.down == 1:
+            return np.zeros(0, dtype=np.float32)
+        if self._stream is not None:
+            return self._stream.resample_chunk(np.zeros(0, dtype=np.float32), last=True)
+        
+        total = self._skip + -(-self._consumed * self.up // self.down)
+        tail = len(self._taps) // self.up + 1
+        self._history = np.concatenate([self._history, np.zeros(tail, dtype=np.float32)])
+        return self._emit(total)
+
+    def _emit(self, available):
+        from scipy.signal import upfirdn
+        
+        if available <= self._produced:
+            return np.zeros(0, dtype=np.float32)
+        
+        offset = self._history_start * self.up // self.down
+        filtered = upfirdn(self._taps, self._history, self.up, self.down)
+        output = filtered[self._produced - offset:available - offset]
+        
+        first = self._produced
+        self._produced = available
+        self._trim_history()
+        
+        if first < self._skip:
+            output = output[self._skip - first:]
+        return output.astype(np.float32, copy=False)
+
+    def _trim_history(self):
+        # Keep inputs needed for the next output; the start stays a multiple
+        # of `down` so the retained history lines up with the output grid
+        needed = max(0, (self._produced * self.down - len(self._taps) + 1) // self.up)
+        needed -= needed % self.down
+        if needed > self._history_start:
+            self._history = self._history[needed - self._history_start:]
+            self._history_start = needed
 
 def preprocess_audio(audio_data, sample_rate, target_sr=16000):
     """Preprocess audio for Whisper model"""
     try:
         # Resample to 16kHz if needed
         if sample_rate != target_sr:
-            audio_data = librosa.resample(audio_data, orig_sr=sample_rate, target_sr=target_sr)
+            audio_data = resample_audio(audio_data, sample_rate, target_sr)
         
         # Normalize audio
         audio_data = audio_data.astype(np.float32)
@@ -255,153 +825,913 @@ def preprocess_audio(audio_data, sample_rate, target_sr=16000):
         st.error(f"Error preprocessing audio: {str(e)}")
         return None, None
 
-def transcribe_audio(processor, model, device, audio_data, language="sw"):
+# Number of 30-second windows decoded together in one generate() call
+LONG_AUDIO_BATCH_SIZE = int(os.getenv("KASUKU_BATCH_SIZE", "4"))
+
+def transcribe_audio(processor, model, device, audio_data, language="sw", batch_size=None,
+                     use_cache=True):
     """
     Transcribe audio using the Whisper model with support for longer audio.
     Implements chunking strategy for audio longer than 30 seconds.
+    Results are cached by audio content and decoding settings, so repeated
+    requests for the same clip return instantly and identically.
     """
     try:
-        # Whisper models work best with 30-second chunks
-        CHUNK_LENGTH = 30  # seconds
-        SAMPLE_RATE = 16000
-        chunk_samples = CHUNK_LENGTH * SAMPLE_RATE
-        
-        # Check if audio needs chunking
-        audio_length = len(audio_data) / SAMPLE_RATE
-        
-        if audio_length <= CHUNK_LENGTH:
-            # Short audio - process directly
-            return _transcribe_single_chunk(
-                processor, model, device, audio_data, language
-            )
-        else:
-            # Long audio - use chunking with overlap
-            return _transcribe_long_audio(
-                processor, model, device, audio_data, language, 
-                chunk_samples, SAMPLE_RATE
-            )
+        cache = get_transcription_cache() if use_cache else None
+        if cache is not None:
+            cache_key = transcription_cache_key(audio_data, model, language)
+            cached = cache.get(cache_key)
+            if cached is not None:
+                return cached
+        
+        transcription = _transcribe_uncached(
+            processor, model, device, audio_data, language, batch_size
+        )
+        
+        if cache is not None and transcription is not None:
+            cache.put(cache_key, transcription)
+        return transcription
             
     except Exception as e:
         st.error(f"Error during transcription: {str(e)}")
         return None
 
-def _transcribe_single_chunk(processor, model, device, audio_data, language):
-    """Transcribe a single chunk of audio (≤30 seconds)"""
-    # Process audio
-    inputs = processor(audio_data, sampling_rate=16000, return_tensors="pt")
-    input_features = inputs.input_features.to(device)
+def _transcribe_uncached(processor, model, device, audio_data, language, batch_size=None):
+    """Run the model (or model server) on preprocessed 16 kHz audio"""
+    if isinstance(model, RemoteModel):
+        return model.transcribe(audio_data, language)
+    
+    # Whisper models work best with 30-second chunks
+    CHUNK_LENGTH = 30  # seconds
+    SAMPLE_RATE = 16000
+    chunk_samples = CHUNK_LENGTH * SAMPLE_RATE
+    
+    # Check if audio needs chunking
+    audio_length = len(audio_data) / SAMPLE_RATE
+    
+    if audio_length <= CHUNK_LENGTH:
+        # Short audio - process directly
+        return _transcribe_single_chunk(
+            processor, model, device, audio_data, language
+        )
+    else:
+        # Long audio - use chunking with overlap
+        return _transcribe_long_audio(
+            processor, model, device, audio_data, language, 
+            chunk_samples, SAMPLE_RATE,
+            batch_size=batch_size or LONG_AUDIO_BATCH_SIZE
+        )
+
+# Transcription result cache: an in-memory LRU tier plus an optional
+# on-disk tier (enabled by setting KASUKU_TRANSCRIPTION_CACHE_DIR)
+TRANSCRIPTION_CACHE_ENTRIES = int(os.getenv("KASUKU_TRANSCRIPTION_CACHE_ENTRIES", "256"))
+TRANSCRIPTION_CACHE_DIR = os.getenv("KASUKU_TRANSCRIPTION_CACHE_DIR", "")
+TRANSCRIPTION_CACHE_MAX_MB = float(os.getenv("KASUKU_TRANSCRIPTION_CACHE_MAX_MB", "64"))
+
+class ContentAddressedCache:
+    """
+    Two-tier cache of values by content address. Lookups check the memory
+    tier first, then the disk tier (promoting hits to memory). The memory
+    tier keeps the most recently used values up to max_memory_entries
+    and/or max_memory_bytes; the disk tier stores one file per key and,
+    once it grows past max_disk_bytes, evicts the least recently used files
+    down to DISK_LOW_WATER of the budget.
+    
+    Disk usage is tracked incrementally in an index (loaded once at
+    startup), so writes never rescan the folder. Files that another
+    process writes to a shared folder join the index when first read here.
+    The lock only guards the in-memory state; files are read, written and
+    deleted outside it, so a slow disk never holds up memory hits.
+    Subclasses define how values are stored on disk (_encode/_decode).
+    """
+    
+    DISK_LOW_WATER = 0.9
+    
+    def __init__(self, cache_dir=None, max_disk_bytes=64 * 1024 * 1024, max_memory_entries=None,
+                 max_memory_bytes=None, suffix=".bin", name="Cache"):
+        from collections import OrderedDict
+        
+        self.cache_dir = Path(cache_dir) if cache_dir else None
+        self.max_disk_bytes = max_disk_bytes
+        self.max_memory_entries = max_memory_entries
+        self.max_memory_bytes = max_memory_bytes
+        self.suffix = suffix
+        self.name = name
+        
+        self._memory = OrderedDict()    # key -> value, least recently used first
+        self._memory_bytes = 0
+        self._disk = OrderedDict()      # key -> file size, least recently used first
+        self._disk_bytes = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        self.evictions = 0
+        
+        if self.cache_dir is not None:
+            try:
+                self.cache_dir.mkdir(parents=True, exist_ok=True)
+                self._load_disk_index()
+            except OSError as e:
+                print(f"{self.name} disabled, cannot use {self.cache_dir}: {e}")
+                self.cache_dir = None
+    
+    def _encode(self, value):
+        return value
+    
+    def _decode(self, data):
+        return data
+    
+    def _size(self, value):
+        return len(value)
+    
+    def get(self, key):
+        """Return the cached value for key, or None"""
+        with self._lock:
+            if key in self._memory:
+                self._memory.move_to_end(key)
+                if key in self._disk:
+                    # Replayed values keep their file too
+                    self._disk.move_to_end(key)
+                self.hits += 1
+                return self._memory[key]
+        
+        read = self._read_disk(key)
+        with self._lock:
+            if read is None:
+                self.misses += 1
+                return None
+            
+            value, size = read
+            self.hits += 1
+            self.disk_hits += 1
+            self._index(key, size)
+            self._remember(key, value)
+            return value
+    
+    def contains(self, key):
+        """Whether key is cached in either tier, without loading it or counting a lookup"""
+        with self._lock:
+            if key in self._memory or key in self._disk:
+                return True
+        return self.cache_dir is not None and self._path(key).exists()
+    
+    def put(self, key, value):
+        """Store a value in both tiers"""
+        with self._lock:
+            self._remember(key, value)
+        
+        size = self._write_disk(key, value)
+        if size is None:
+            return
+        with self._lock:
+            self._index(key, size)
+            evicted = self._evict_disk() if self._disk_bytes > self.max_disk_bytes else []
+        for evicted_key in evicted:
+            try:
+                self._path(evicted_key).unlink()
+            except OSError:
+                pass
+    
+    def stats(self):
+        """Hit/miss counters, hit rate and tier sizes"""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "disk_hits": self.disk_hits,
+                "misses": self.misses,
+                "hit_rate": self.hits / lookups if lookups else 0.0,
+                "evictions": self.evictions,
+                "memory_entries": len(self._memory),
+                "memory_bytes": self._memory_bytes,
+                "disk_entries": len(self._disk),
+                "disk_bytes": self._disk_bytes,
+            }
+    
+    def _path(self, key):
+        return self.cache_dir / f"{key}{self.suffix}"
+    
+    def _load_disk_index(self):
+        files = []
+        for f in self.cache_dir.glob(f"*{self.suffix}"):
+            try:
+                stat = f.stat()
+                files.append((stat.st_mtime, f.name[:-len(self.suffix)], stat.st_size))
+            except OSError:
+                pass
+        for _, key, size in sorted(files):
+            self._disk[key] = size
+            self._disk_bytes += size
+    
+    def _remember(self, key, value):
+        if key in self._memory:
+            self._memory_bytes -= self._size(self._memory.pop(key))
+        self._memory[key] = value
+        self._memory_bytes += self._size(value)
+        while len(self._memory) > 1 and (
+            (self.max_memory_entries is not None and len(self._memory) > self.max_memory_entries)
+            or (self.max_memory_bytes is not None and self._memory_bytes > self.max_memory_bytes)
+        ):
+            _, evicted = self._memory.popitem(last=False)
+            self._memory_bytes -= self._size(evicted)
+    
+    def _index(self, key, size):
+        self._disk_bytes += size - self._disk.pop(key, 0)
+        self._disk[key] = size
+    
+    def _read_disk(self, key):
+        """(value, file size) from the disk tier, or None"""
+        if self.cache_dir is None:
+            return None
+        path = self._path(key)
+        try:
+            data = path.read_bytes()
+            value = self._decode(data)
+            os.utime(path)  # mark as recently used
+        except (OSError, ValueError, KeyError):
+            return None
+        return value, len(data)
+    
+    def _write_disk(self, key, value):
+        """Write a value's file and return its size, or None if it wasn't written"""
+        if self.cache_dir is None:
+            return None
+        path = self._path(key)
+        try:
+            data = self._encode(value)
+            tmp_path = path.with_suffix(f".{uuid.uuid4().hex}.tmp")
+            tmp_path.write_bytes(data)
+            os.replace(tmp_path, path)
+        except OSError as e:
+            print(f"{self.name} write error: {e}")
+            return None
+        return len(data)
+    
+    def _evict_disk(self):
+        """Drop the least recently used keys from the index (caller holds the lock) and return them"""
+        # Down to the low-water mark so a full cache doesn't evict again on every write
+        target = self.max_disk_bytes * self.DISK_LOW_WATER
+        evicted = []
+        while self._disk and self._disk_bytes > target:
+            key, size = self._disk.popitem(last=False)
+            self._disk_bytes -= size
+            self.evictions += 1
+            evicted.append(key)
+        return evicted
+
+class TranscriptionCache(ContentAddressedCache):
+    """
+    Content-addressed transcription cache: up to max_entries transcriptions
+    in memory, plus one small JSON file per key on disk.
+    """
+
+    def __init__(self, max_entries=TRANSCRIPTION_CACHE_ENTRIES, cache_dir=None,
+                 max_disk_bytes=int(TRANSCRIPTION_CACHE_MAX_MB * 1024 * 1024)):
+        super().__init__(cache_dir=cache_dir, max_disk_bytes=max_disk_bytes,
+                         max_memory_entries=max(1, max_entries), suffix=".json",
+                         name="Transcription cache")
+    
+    def _encode(self, transcription):
+        return json.dumps({"transcription": transcription}).encode("utf-8")
+    
+    def _decode(self, data):
+        return json.loads(data)["transcription"]
+    
+    def _size(self, transcription):
+        return len(transcription)
+
+@st.cache_resource
+def get_transcription_cache():
+    """Process-wide transcription cache shared by all sessions"""
+    return TranscriptionCache(cache_dir=TRANSCRIPTION_CACHE_DIR or None)
+
+def transcription_cache_key(audio_data, model, language):
+    """Digest of the 16 kHz audio plus everything that affects the decoded text"""
+    if isinstance(model, RemoteModel):
+        model_id = f"remote|{model.url}"
+    else:
+        model_id = getattr(model, "kasuku_variant", None) or getattr(model, "name_or_path", type(model).__name__)
+    
+    settings = {
+        "model": model_id,
+        "language": language,
+        "generation": _generation_kwargs(language),
+        "segmentation": SEGMENTATION_MODE,
+    }
+    
+    digest = hashlib.blake2b(digest_size=32)
+    digest.update(np.ascontiguousarray(audio_data, dtype=np.float32).tobytes())
+    digest.update(json.dumps(settings, sort_keys=True).encode("utf-8"))
+    return digest.hexdigest()
+
+def _generation_kwargs(language):
+    """Decoding parameters used for each language"""
+    if language == "sw":
+        return {
+            "language": language,
+            "task": "transcribe",
+            "max_length": 1024,
+            "num_beams": 5,
+            "do_sample": True,
+            "temperature": 0.9,
+            "top_p": 0.9
+        }
+    # English
+    return {
+        "language": language,
+        "task": "transcribe",
+        "max_length": 1024,
+        "num_beams": 5,
+        "do_sample": False
+    }
+
+def _generate_from_features(processor, model, device, input_features, language,
+                            return_timestamps=False):
+    """
+    Transcribe a batch of log-mel features, going through the shared
+    micro-batching scheduler for this model when it is enabled.
+    """
+    if MICROBATCH_ENABLED:
+        scheduler = get_batch_scheduler(processor, model, device, language, return_timestamps)
+        # An unloaded model has no scheduler; its last users decode directly
+        future = scheduler.submit(input_features) if scheduler is not None else None
+        if future is not None:
+            return future.result()
+    return _decode_features(processor, model, device, input_features, language, return_timestamps)
+
+def _ends_mid_segment(token_ids, tokenizer):
+    """
+    True if decoding stopped inside a segment, i.e. text tokens follow the
+    last timestamp token. The offsets returned by the tokenizer leave that
+    unfinished segment out.
+    """
+    timestamp_begin = tokenizer.all_special_ids[-1] + 1
+    special_ids = set(tokenizer.all_special_ids)
+    timestamps = [i for i, token in enumerate(token_ids) if token >= timestamp_begin]
+    tail = token_ids[timestamps[-1] + 1:] if timestamps else token_ids
+    return any(token not in special_ids for token in tail)
+
+def _decode_features(processor, model, device, input_features, language, return_timestamps=False):
+    """
+    Run generate() on a batch of log-mel features and decode every row.
+    With return_timestamps, each row is a dict with the text and its
+    segment offsets ({"text", "timestamp": (start, end)} in seconds).
+    """
+    input_features = input_features.to(device, dtype=getattr(model, "dtype", torch.float32))
+    
+    generation_kwargs = _generation_kwargs(language)
+    if return_timestamps:
+        generation_kwargs["return_timestamps"] = True
     
-    # Generate transcription with appropriate parameters
     with torch.no_grad():
-        if language == "sw":
-            predicted_ids = model.generate(
-                input_features,
-                language=language,
-                task="transcribe",
-                max_length=1024,
-                num_beams=5,
-                do_sample=True,
-                temperature=0.9,
-                top_p=0.9
-            )
-        else:  # English
-            predicted_ids = model.generate(
-                input_features,
-                language=language,
-                task="transcribe",
-                max_length=1024,
-                num_beams=5,
-                do_sample=False
+        predicted_ids = model.generate(input_features, **generation_kwargs)
+    
+    if return_timestamps:
+        decoded = processor.batch_decode(predicted_ids, skip_special_tokens=True, output_offsets=True)
+        return [
+            {"text": d["text"].strip(), "offsets": d["offsets"],
+             "truncated": _ends_mid_segment(ids, processor.tokenizer)}
+            for d, ids in zip(decoded, predicted_ids.tolist())
+        ]
+    
+    transcriptions = processor.batch_decode(predicted_ids, skip_special_tokens=True)
+    return [transcription.strip() for transcription in transcriptions]
+
+# Cross-session micro-batching: pending windows from concurrent sessions
+# are coalesced into one generate() call per model
+MICROBATCH_ENABLED = os.getenv("KASUKU_MICROBATCH", "1") == "1"
+MICROBATCH_MAX_BATCH_SIZE = int(os.getenv("KASUKU_MICROBATCH_MAX_BATCH", "8"))
+MICROBATCH_MAX_WAIT_MS = float(os.getenv("KASUKU_MICROBATCH_MAX_WAIT_MS", "25"))
+
+class BatchScheduler:
+    """
+    Request queue in front of one model. A background thread collects
+    pending feature batches for up to max_wait_ms (or until max_batch_size
+    windows are queued), decodes them in a single generate() call and hands
+    each caller its own rows back.
+    """
+
+    def __init__(self, processor, model, device, language, return_timestamps=False,
+                 max_batch_size=MICROBATCH_MAX_BATCH_SIZE,
+                 max_wait_ms=MICROBATCH_MAX_WAIT_MS):
+        self.processor = processor
+        self.model = model
+        self.device = device
+        self.language = language
+        self.return_timestamps = return_timestamps
+        self.max_batch_size = max(1, int(max_batch_size))
+        self.max_wait = max(0.0, max_wait_ms) / 1000.0
+        
+        self._queue = queue.Queue()
+        self._carry = None  # request that did not fit in the previous batch
+        self._closed = False
+        self._lock = threading.Lock()
+        self._thread = threading.Thread(
+            target=self._run, name=f"kasuku-batcher-{language}", daemon=True
+        )
+        self._thread.start()
+
+    def submit(self, input_features):
+        """
+        Queue a (n, mels, frames) feature tensor, returns a Future of n
+        strings, or None once the scheduler has been shut down
+        """
+        with self._lock:
+            if self._closed:
+                return None
+            future = Future()
+            self._queue.put((input_features, future))
+            return future
+
+    def transcribe(self, input_features):
+        """Blocking wrapper around submit()"""
+        future = self.submit(input_features)
+        if future is None:
+            raise RuntimeError("Batch scheduler has been shut down")
+        return future.result()
+
+    def close(self):
+        """Stop the worker thread after the queued requests are served"""
+        with self._lock:
+            self._closed = True
+            self._queue.put(None)
+
+    def _next_request(self, timeout=None):
+        if self._carry is not None:
+            request, self._carry = self._carry, None
+            return request
+        return self._queue.get(timeout=timeout)
+
+    def _run(self):
+        while True:
+            request = self._next_request()
+            if request is None:
+                return
+            
+            pending = [request]
+            rows = request[0].shape[0]
+            deadline = time.monotonic() + self.max_wait
+            stop_after_batch = False
+            
+            while rows < self.max_batch_size:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    request = self._next_request(timeout=remaining)
+                except queue.Empty:
+                    break
+                if request is None:
+                    stop_after_batch = True
+                    break
+                if rows + request[0].shape[0] > self.max_batch_size:
+                    self._carry = request
+                    break
+                pending.append(request)
+                rows += request[0].shape[0]
+            
+            self._run_batch(pending)
+            if stop_after_batch:
+                return
+
+    def _run_batch(self, pending):
+        # Skip callers that gave up while queued
+        pending = [(features, future) for features, future in pending
+                   if future.set_running_or_notify_cancel()]
+        if not pending:
+            return
+        
+        try:
+            input_features = torch.cat([features for features, _ in pending], dim=0)
+            transcriptions = _decode_features(
+                self.processor, self.model, self.device, input_features,
+                self.language, self.return_timestamps
             )
+        except Exception as e:
+            for _, future in pending:
+                future.set_exception(e)
+            return
+        
+        offset = 0
+        for features, future in pending:
+            count = features.shape[0]
+            future.set_result(transcriptions[offset:offset + count])
+            offset += count
+
+_batch_schedulers = {}
+_batch_schedulers_lock = threading.Lock()
+# Models unloaded by the model manager; sessions still holding one decode
+# directly, so no new scheduler keeps it alive
+_retired_models = weakref.WeakSet()
+
+def get_batch_scheduler(processor, model, device, language, return_timestamps=False):
+    """
+    Return the process-wide scheduler for a loaded model, creating it on
+    first use, or None if the model has been unloaded.
+    """
+    # Requests are only batched with others that use the same decoding settings
+    key = (id(model), language, return_timestamps)
+    with _batch_schedulers_lock:
+        if model in _retired_models:
+            return None
+        scheduler = _batch_schedulers.get(key)
+        if scheduler is None or scheduler.model is not model:
+            scheduler = BatchScheduler(processor, model, device, language, return_timestamps)
+            _batch_schedulers[key] = scheduler
+        return scheduler
+
+def shutdown_batch_schedulers(timeout=5.0, model=None):
+    """
+    Stop scheduler worker threads: every one on exit, or only those serving
+    `model` when it is unloaded (no new ones are started for it after that).
+    """
+    with _batch_schedulers_lock:
+        if model is not None:
+            _retired_models.add(model)
+        keys = [key for key, scheduler in _batch_schedulers.items()
+                if model is None or scheduler.model is model]
+        schedulers = [_batch_schedulers.pop(key) for key in keys]
+    for scheduler in schedulers:
+        scheduler.close()
+    for scheduler in schedulers:
+        scheduler._thread.join(timeout=timeout)
+
+atexit.register(shutdown_batch_schedulers)
+
+@functools.lru_cache(maxsize=8)
+def _log_mel_constants(feature_extractor, device):
+    """Hann window and mel filter bank for a feature extractor, kept on the device"""
+    window = torch.hann_window(feature_extractor.n_fft, device=device)
+    mel_filters = torch.from_numpy(
+        np.asarray(feature_extractor.mel_filters, dtype=np.float32).T.copy()
+    ).to(device)
+    return window, mel_filters
+
+def extract_log_mel(processor, chunks, device="cpu"):
+    """
+    Whisper log-mel features for many windows with one batched torch.stft
+    call on `device`. Each window is padded (or cut) to 30 s exactly as
+    WhisperProcessor does, and the result matches processor(...).input_features
+    to within float32 rounding.
+    """
+    feature_extractor = processor.feature_extractor
+    n_samples = feature_extractor.n_samples
+    if isinstance(chunks, np.ndarray) and chunks.ndim == 1:
+        chunks = [chunks]
+
+    # Zero-pad on the host and move the whole batch across in one copy
+    waveforms = np.zeros((len(chunks), n_samples), dtype=np.float32)
+    for i, chunk in enumerate(chunks):
+        chunk = np.asarray(chunk, dtype=np.float32)[:n_samples]
+        waveforms[i, :len(chunk)] = chunk
+
+    device = torch.device(device)
+    window, mel_filters = _log_mel_constants(feature_extractor, device)
+    waveforms = torch.from_numpy(waveforms).to(device)
+
+    with torch.no_grad():
+        stft = torch.stft(waveforms, feature_extractor.n_fft, feature_extractor.hop_length,
+                          window=window, return_complex=True)
+        magnitudes = stft[..., :-1].abs() ** 2
+        log_spec = torch.clamp(mel_filters @ magnitudes, min=1e-10).log10()
+        # Dynamic range is limited per window, not across the batch
+        max_val = log_spec.amax(dim=(1, 2), keepdim=True)
+        log_spec = torch.maximum(log_spec, max_val - 8.0)
+        return (log_spec + 4.0) / 4.0
+
+# Warm-up: dummy clips run through each model at process start so the first
+# real request doesn't pay for allocator growth, kernel selection and lazy
+# initialization inside generate()
+WARMUP_ENABLED = os.getenv("KASUKU_WARMUP", "0") == "1"
+WARMUP_CLIP_SECONDS = [float(s) for s in os.getenv("KASUKU_WARMUP_SECONDS", "5,30,60").split(",") if s]
+WARMUP_MAX_NEW_TOKENS = 8
+
+_readiness = {"state": "cold", "models": {}, "started": None, "finished": None}
+_readiness_lock = threading.Lock()
+
+def get_readiness():
+    """
+    Snapshot of the warm-up state for the UI and health checks:
+    "cold" (not started), "warming", "ready" or "failed", plus per-model
+    timings in seconds ({"cold": {...}, "warm": {...}} by clip length).
+    """
+    with _readiness_lock:
+        return json.loads(json.dumps(_readiness))
+
+def _set_readiness(language=None, **fields):
+    with _readiness_lock:
+        target = _readiness if language is None else _readiness["models"].setdefault(language, {})
+        target.update(fields)
+
+def _warmup_clip(seconds, sample_rate=16000):
+    """Voice-like dummy audio: a gliding harmonic tone with a little noise"""
+    t = np.arange(int(seconds * sample_rate), dtype=np.float32) / sample_rate
+    phase = 2 * np.pi * np.cumsum(140 + 30 * np.sin(2 * np.pi * 0.5 * t)) / sample_rate
+    audio = sum(np.sin(k * phase) / k for k in range(1, 4)) * 0.1
+    audio += 0.005 * np.random.default_rng(0).standard_normal(len(t))
+    return audio.astype(np.float32)
+
+def warm_up_model(processor, model, device, language, clip_seconds=None):
+    """
+    Run dummy clips through one model the way real requests are shaped: one
+    30 s window for short clips, a batch of windows for long ones. Each clip
+    runs twice; returns {"cold": {seconds: s}, "warm": {seconds: s}}.
+    """
+    generation_kwargs = _generation_kwargs(language)
+    generation_kwargs.pop("max_length", None)
+    generation_kwargs["max_new_tokens"] = WARMUP_MAX_NEW_TOKENS
+    dtype = getattr(model, "dtype", torch.float32)
+    
+    timings = {"cold": {}, "warm": {}}
+    for phase in ("cold", "warm"):
+        for seconds in clip_seconds or WARMUP_CLIP_SECONDS:
+            audio_data = _warmup_clip(seconds)
+            window = processor.feature_extractor.n_samples
+            windows = [audio_data[i:i + window] for i in range(0, len(audio_data), window)]
+            windows = windows[:max(1, LONG_AUDIO_BATCH_SIZE)]
+            
+            start_time = time.time()
+            input_features = extract_log_mel(processor, windows, device).to(device, dtype=dtype)
+            with torch.no_grad():
+                predicted_ids = model.generate(input_features, **generation_kwargs)
+            processor.batch_decode(predicted_ids, skip_special_tokens=True)
+            timings[phase][f"{seconds:g}"] = round(time.time() - start_time, 3)
+    return timings
+
+def warm_up_models(languages=None, manager=None):
+    """
+    Load and warm each language's model, recording progress in the readiness
+    state. Models that don't fit in the memory budget next to the ones
+    already warmed are skipped rather than evicting them.
+    Returns get_readiness().
+    """
+    manager = manager or get_model_manager()
+    languages = list(languages or manager.model_names)
+    _set_readiness(state="warming", started=time.time(), finished=None)
+    for language in languages:
+        _set_readiness(language, state="pending")
+    
+    failed = False
+    for language in languages:
+        if not manager.fits(language):
+            _set_readiness(language, state="skipped", error="Does not fit in the memory budget")
+            continue
+        _set_readiness(language, state="warming")
+        try:
+            start_time = time.time()
+            processor, model, device = manager.get(language, touch=False)
+            load_seconds = time.time() - start_time
+            timings = warm_up_model(processor, model, device, language)
+            _set_readiness(language, state="ready", load_seconds=round(load_seconds, 3), **timings)
+            print(f"Warmed up {manager.model_names[language]}: cold {timings['cold']}, warm {timings['warm']}")
+        except Exception as e:
+            failed = True
+            _set_readiness(language, state="failed", error=str(e))
+            print(f"Warning: Warm-up of {manager.model_names[language]} failed: {str(e)}")
+    
+    _set_readiness(state="failed" if failed else "ready", finished=time.time())
+    return get_readiness()
+
+@st.cache_resource
+def start_warmup():
+    """
+    Start warming every model in a background thread, once per process.
+    Without KASUKU_WARMUP=1 (or with a model server, which warms itself)
+    the process is reported ready straight away.
+    """
+    if not WARMUP_ENABLED or MODEL_SERVER_URL:
+        _set_readiness(state="ready", finished=time.time())
+        return None
+    _set_readiness(state="warming")
+    thread = threading.Thread(target=warm_up_models, name="kasuku-warmup", daemon=True)
+    thread.start()
+    return thread
+
+def _transcribe_single_chunk(processor, model, device, audio_data, language):
+    """Transcribe a single chunk of audio (≤30 seconds)"""
+    input_features = extract_log_mel(processor, audio_data, device)
+    return _generate_from_features(
+        processor, model, device, input_features, language
+    )[0]
+
+# How long audio is split: "vad" cuts at pauses and skips silence,
+# "fixed" uses 30 s windows with a short overlap merged by timestamps
+SEGMENTATION_MODE = os.getenv("KASUKU_SEGMENTATION", "vad").lower()
+
+def detect_speech_segments(audio_data, sample_rate=16000, max_segment_seconds=30.0,
+                           frame_ms=30, min_silence_ms=400, min_speech_ms=120,
+                           padding_ms=200, threshold_db=12.0):
+    """
+    Energy/spectral voice activity detection.
+    
+    Frames whose energy sits threshold_db above the estimated noise floor
+    (and that are not spectrally flat like hiss) count as speech. Pauses
+    shorter than min_silence_ms are bridged, blips shorter than min_speech_ms
+    are dropped, and regions longer than max_segment_seconds are split at
+    their quietest frame.
+    
+    Returns a list of (start_sample, end_sample) tuples; silence is omitted.
+    """
+    frame_len = int(sample_rate * frame_ms / 1000)
+    num_frames = len(audio_data) // frame_len
+    if num_frames == 0:
+        return []
+    
+    frames = np.asarray(audio_data[:num_frames * frame_len], dtype=np.float32).reshape(num_frames, frame_len)
+    
+    # Per-frame energy in dB and spectral flatness (geometric / arithmetic mean)
+    energy_db = 10 * np.log10(np.mean(frames ** 2, axis=1) + 1e-10)
+    spectrum = np.abs(np.fft.rfft(frames * np.hanning(frame_len), axis=1)) ** 2 + 1e-10
+    flatness = np.exp(np.mean(np.log(spectrum), axis=1)) / np.mean(spectrum, axis=1)
+    
+    noise_floor = np.percentile(energy_db, 10)
+    threshold = max(noise_floor + threshold_db, np.max(energy_db) - 50)
+    is_speech = (energy_db > threshold) & ((flatness < 0.5) | (energy_db > threshold + 10))
+    
+    # Speech regions as [start_frame, end_frame) runs
+    edges = np.diff(np.concatenate([[0], is_speech.astype(np.int8), [0]]))
+    regions = list(zip(np.flatnonzero(edges == 1), np.flatnonzero(edges == -1)))
+    
+    # Bridge short pauses, then drop short blips
+    min_silence = max(1, min_silence_ms // frame_ms)
+    bridged = []
+    for start, end in regions:
+        if bridged and start - bridged[-1][1] < min_silence:
+            bridged[-1] = (bridged[-1][0], end)
+        else:
+            bridged.append((start, end))
+    min_speech = max(1, min_speech_ms // frame_ms)
+    regions = [(start, end) for start, end in bridged if end - start >= min_speech]
+    
+    # Pad regions so word onsets/offsets are not clipped
+    padding = padding_ms // frame_ms
+    regions = [(max(0, start - padding), min(num_frames, end + padding)) for start, end in regions]
+    
+    # Split regions longer than the limit at their quietest frame
+    max_frames = int(max_segment_seconds * 1000 // frame_ms)
+    pieces = []
+    for start, end in regions:
+        while end - start > max_frames:
+            search_from = start + max_frames // 2
+            cut = search_from + int(np.argmin(energy_db[search_from:start + max_frames]))
+            pieces.append((start, cut))
+            start = cut
+        pieces.append((start, end))
+    
+    return [(start * frame_len, min(len(audio_data), end * frame_len)) for start, end in pieces]
+
+def pack_speech_segments(audio_data, segments, max_samples, gap_samples=3200):
+    """
+    Concatenate consecutive speech segments into windows of at most
+    max_samples, keeping a short silence (gap_samples, 0.2 s at 16 kHz)
+    between them so the model still hears a pause. Long silences between
+    segments are dropped, so fewer windows need an encoder pass.
+    """
+    gap = np.zeros(gap_samples, dtype=np.float32)
+    windows = []
+    current = []
+    current_len = 0
     
-    # Decode transcription
-    transcription = processor.batch_decode(predicted_ids, skip_special_tokens=True)[0]
-    return transcription.strip()
+    for start, end in segments:
+        piece = audio_data[start:end]
+        added = len(piece) + (gap_samples if current else 0)
+        if current and current_len + added > max_samples:
+            windows.append(np.concatenate(current))
+            current, current_len = [], 0
+            added = len(piece)
+        if current:
+            current.append(gap)
+        current.append(piece)
+        current_len += added
+    
+    if current:
+        windows.append(np.concatenate(current))
+    return windows
+
+def _fixed_windows(total_samples, chunk_samples, overlap_samples):
+    """(start, end) sample bounds of overlapping fixed-length windows"""
+    num_chunks = max(1, int(np.ceil((total_samples - overlap_samples) / 
+                                    (chunk_samples - overlap_samples))))
+    
+    windows = []
+    for i in range(num_chunks):
+        start_idx = i * (chunk_samples - overlap_samples)
+        end_idx = min(start_idx + chunk_samples, total_samples)
+        windows.append((start_idx, end_idx))
+    return windows
 
 def _transcribe_long_audio(processor, model, device, audio_data, language, 
-                           chunk_samples, sample_rate):
+                           chunk_samples, sample_rate, batch_size=LONG_AUDIO_BATCH_SIZE):
     """
-    Transcribe long audio by splitting into overlapping chunks.
-    Uses 5-second overlap to maintain context between chunks.
+    Transcribe long audio in ≤30 s pieces. With VAD segmentation the pieces
+    follow pauses in speech and silence is skipped; otherwise fixed windows
+    with a 3-second overlap are decoded with timestamps and merged by time.
     """
-    OVERLAP = 5  # seconds overlap between chunks
-    overlap_samples = OVERLAP * sample_rate
+    if SEGMENTATION_MODE == "vad":
+        segments = detect_speech_segments(
+            audio_data, sample_rate, max_segment_seconds=chunk_samples / sample_rate
+        )
+        if not segments:
+            return ""
+        chunks = pack_speech_segments(audio_data, segments, chunk_samples)
+        transcriptions = _transcribe_windows(
+            processor, model, device, chunks, language, sample_rate, batch_size
+        )
+        # Segments do not overlap, so the text simply follows on
+        return " ".join(" ".join(transcriptions).split())
     
-    transcriptions = []
-    total_samples = len(audio_data)
+    OVERLAP = 3  # seconds overlap between chunks
+    windows = _fixed_windows(len(audio_data), chunk_samples, OVERLAP * sample_rate)
+    chunks = [audio_data[start:end] for start, end in windows]
     
-    # Calculate number of chunks
-    num_chunks = max(1, int(np.ceil((total_samples - overlap_samples) / 
-                                    (chunk_samples - overlap_samples))))
+    outputs = _transcribe_windows(
+        processor, model, device, chunks, language, sample_rate, batch_size,
+        return_timestamps=True
+    )
+    return _merge_timestamped_windows(windows, outputs, sample_rate)
+
+def _transcribe_windows(processor, model, device, chunks, language, sample_rate, batch_size,
+                        return_timestamps=False):
+    """
+    Decode audio windows in batches. Features for each batch are extracted
+    with one batched STFT on the model's device right before it is decoded,
+    and the progress bar advances once per decoded batch.
+    Returns one result per window, in order.
+    """
+    batch_size = max(1, int(batch_size))
+    num_batches = int(np.ceil(len(chunks) / batch_size))
     
     # Progress bar for long audio
     progress_bar = st.progress(0)
     status_text = st.empty()
     
-    for i in range(num_chunks):
-        # Calculate chunk boundaries
-        start_idx = i * (chunk_samples - overlap_samples)
-        end_idx = min(start_idx + chunk_samples, total_samples)
-        
-        # Extract chunk
-        chunk = audio_data[start_idx:end_idx]
-        
-        # Update progress
-        progress = (i + 1) / num_chunks
-        progress_bar.progress(progress)
+    transcriptions = []
+    for b in range(num_batches):
+        status_text.text(f"Transcribing part {b + 1} of {num_batches}...")
         
-        # Transcribe chunk
-        chunk_transcription = _transcribe_single_chunk(
-            processor, model, device, chunk, language
+        batch_features = extract_log_mel(
+            processor, chunks[b * batch_size:(b + 1) * batch_size], device
         )
+        transcriptions.extend(_generate_from_features(
+            processor, model, device, batch_features, language, return_timestamps
+        ))
         
-        if chunk_transcription:
-            transcriptions.append(chunk_transcription)
+        progress_bar.progress((b + 1) / num_batches)
     
     # Clear progress indicators
     progress_bar.empty()
     status_text.empty()
     
-    # Combine transcriptions with smart merging
-    final_transcription = _merge_transcriptions(transcriptions)
-    
-    return final_transcription
+    return transcriptions
 
-def _merge_transcriptions(transcriptions):
+def _merge_timestamped_windows(windows, outputs, sample_rate):
     """
-    Intelligently merge chunk transcriptions, removing duplicate phrases
-    at overlap boundaries.
-    """
-    if not transcriptions:
-        return ""
-    
-    if len(transcriptions) == 1:
-        return transcriptions[0]
+    Merge overlapping windows by time instead of by matching words.
     
-    merged = transcriptions[0]
+    Each window owns the speech between the midpoints of its overlaps with
+    its neighbours and keeps only the segments that start inside that span.
+    When a window's last segment runs into the window edge and the next
+    window hears all of it, ownership moves to the next window at that
+    segment's start. When decoding stopped inside a segment (the output is
+    "truncated"), that segment is missing from the offsets, so the next
+    window owns everything after the last complete segment. Runs in a
+    single pass over the segments.
+    """
+    texts = []
+    boundary = 0.0  # absolute time from which the current window owns speech
     
-    for i in range(1, len(transcriptions)):
-        current = transcriptions[i]
+    for i, ((start, end), output) in enumerate(zip(windows, outputs)):
+        offset = start / sample_rate
+        window_end = end / sample_rate
         
-        # Try to find overlap by checking last words of merged with first words of current
-        merged_words = merged.split()
-        current_words = current.split()
+        segments = [
+            (offset + segment["timestamp"][0], offset + segment["timestamp"][1], segment["text"])
+            for segment in output["offsets"]
+        ]
+        truncated = output.get("truncated", False)
+        if not segments and output["text"]:
+            # No complete segment - treat the window as one segment
+            segments = [(offset, window_end, output["text"])]
+            truncated = False
         
-        # Check for overlapping sequences (up to 10 words)
-        overlap_found = False
-        for overlap_length in range(min(10, len(merged_words), len(current_words)), 0, -1):
-            if merged_words[-overlap_length:] == current_words[:overlap_length]:
-                # Found overlap - merge without duplication
-                merged = merged + " " + " ".join(current_words[overlap_length:])
-                overlap_found = True
-                break
+        if i == len(windows) - 1:
+            next_boundary = float("inf")
+        else:
+            next_start = windows[i + 1][0] / sample_rate
+            next_boundary = (next_start + window_end) / 2
+            if segments:
+                last_start, last_end, _ = segments[-1]
+                if last_end >= window_end - 0.5 and last_start >= next_start:
+                    next_boundary = min(next_boundary, last_start)
+            if truncated:
+                last_end = segments[-1][1] if segments else boundary
+                next_boundary = min(next_boundary, max(boundary, last_end))
         
-        if not overlap_found:
-            # No overlap found - simple concatenation with space
-            merged = merged + " " + current
+        texts.extend(text for seg_start, _, text in segments if boundary <= seg_start < next_boundary)
+        boundary = next_boundary
     
-    # Clean up extra spaces
-    return " ".join(merged.split())
+    return " ".join(" ".join(texts).split())
 
 def process_recorded_audio(recorded_audio):
     """Process recorded audio from Streamlit audio input"""
@@ -413,6 +1743,194 @@ def process_recorded_audio(recorded_audio):
         st.error(f"Error processing recorded audio: {str(e)}")
         return None, None
 
+# Decoded recordings kept per session (the current one plus the previous)
+INGEST_CACHE_ENTRIES = 2
+
+def ingest_recorded_audio(recorded_audio, target_sr=16000):
+    """
+    Decode, resample to 16 kHz mono and normalize a recording once per session.
+    
+    The upload is digested the first time it is seen and the float32 array
+    is kept in st.session_state keyed by that digest, so later reruns (e.g.
+    copy/speak clicks) reuse it without touching librosa.
+    
+    Returns (digest, audio_data, sample_rate); audio_data is None if decoding failed.
+    """
+    digests = st.session_state.setdefault('ingested_audio_digests', {})
+    cache = st.session_state.setdefault('ingested_audio', {})
+    
+    # The upload's file_id is stable across reruns, so the bytes are only hashed once
+    file_id = getattr(recorded_audio, "file_id", None)
+    digest = digests.get(file_id) if file_id else None
+    if digest is None:
+        digest = hashlib.blake2b(recorded_audio.getvalue(), digest_size=16).hexdigest()
+        if file_id:
+            digests.clear()
+            digests[file_id] = digest
+    
+    if digest in cache:
+        return digest, cache[digest], target_sr
+    
+    audio_data, sample_rate = process_recorded_audio(recorded_audio)
+    if audio_data is None:
+        return digest, None, None
+    
+    audio_data, sample_rate = preprocess_audio(audio_data, sample_rate, target_sr)
+    if audio_data is None:
+        return digest, None, None
+    
+    cache[digest] = audio_data
+    while len(cache) > INGEST_CACHE_ENTRIES:
+        cache.pop(next(iter(cache)))
+    
+    return digest, audio_data, sample_rate
+
+# Live captions: how often partial hypotheses are refreshed and how much
+# audio the rolling buffer holds before its text is finalized
+STREAMING_UPDATE_SECONDS = float(os.getenv("KASUKU_STREAMING_UPDATE_SECONDS", "2.0"))
+STREAMING_MAX_BUFFER_SECONDS = float(os.getenv("KASUKU_STREAMING_MAX_BUFFER_SECONDS", "20.0"))
+
+class StreamingTranscriber:
+    """
+    Incremental transcription of audio arriving in small frames.
+    
+    Frames are appended to a rolling 16 kHz buffer which is re-transcribed
+    every update_seconds. Words that two consecutive hypotheses agree on are
+    treated as stable; once the buffer grows past max_buffer_seconds it is
+    cut at the quietest point near its end and the text before the cut is
+    finalized, so each decode stays well under Whisper's 30 s window.
+    """
+
+    SAMPLE_RATE = 16000
+
+    def __init__(self, processor, model, device, language,
+                 update_seconds=STREAMING_UPDATE_SECONDS,
+                 max_buffer_seconds=STREAMING_MAX_BUFFER_SECONDS):
+        self.processor = processor
+        self.model = model
+        self.device = device
+        self.language = language
+        self.update_seconds = update_seconds
+        self.update_samples = int(update_seconds * self.SAMPLE_RATE)
+        self.max_buffer_samples = int(min(max_buffer_seconds, 28.0) * self.SAMPLE_RATE)
+        
+        self._buffer = np.zeros(0, dtype=np.float32)
+        self._resampler = None
+        self._samples_since_update = 0
+        self._final_words = []
+        self._hypothesis_words = []
+        self._stable_count = 0
+
+    def add_frames(self, samples, sample_rate):
+        """
+        Append raw samples (mono, or shaped (n, channels)) and refresh the
+        hypothesis when enough new audio has arrived.
+        Returns True if the partial result changed.
+        """
+        self.append(samples, sample_rate)
+        return self.update()
+
+    def append(self, samples, sample_rate):
+        """Append raw samples (mono, or shaped (n, channels)) without transcribing"""
+        samples = np.asarray(samples, dtype=np.float32)
+        if samples.ndim > 1:
+            samples = samples.mean(axis=1)
+        if self._resampler is None or self._resampler.orig_sr != int(sample_rate):
+            if self._resampler is not None:
+                self._buffer = np.concatenate([self._buffer, self._resampler.flush()])
+            self._resampler = StreamResampler(sample_rate, self.SAMPLE_RATE)
+        samples = self._resampler.process(samples)
+        
+        self._buffer = np.concatenate([self._buffer, samples])
+        self._samples_since_update += len(samples)
+
+    def update(self, partial=True):
+        """
+        Transcribe once enough new audio has arrived: finalize the start of
+        a full buffer, then refresh the hypothesis. With partial=False (the
+        caller is behind on incoming audio) only a full buffer is decoded.
+        Returns True if the text changed.
+        """
+        if self._samples_since_update < self.update_samples:
+            return False
+        
+        full = len(self._buffer) >= self.max_buffer_samples
+        if not full and not partial:
+            return False
+        
+        self._samples_since_update = 0
+        while len(self._buffer) >= self.max_buffer_samples:
+            self._finalize_prefix()
+        if partial and len(self._buffer):
+            self._update_hypothesis()
+        return True
+
+    def finish(self):
+        """Transcribe whatever is left in the buffer and return the full transcript"""
+        if self._resampler is not None:
+            self._buffer = np.concatenate([self._buffer, self._resampler.flush()])
+            self._resampler = None
+        if len(self._buffer):
+            self._final_words.extend(self._transcribe(self._buffer))
+        self._buffer = np.zeros(0, dtype=np.float32)
+        self._hypothesis_words = []
+        self._stable_count = 0
+        return self.final_text
+
+    @property
+    def final_text(self):
+        """Text that will not change any more"""
+        return " ".join(self._final_words)
+
+    @property
+    def stable_text(self):
+        """Finalized text plus the agreed prefix of the current buffer"""
+        return " ".join(self._final_words + self._hypothesis_words[:self._stable_count])
+
+    @property
+    def partial_text(self):
+        """Tail of the current hypothesis that may still be revised"""
+        return " ".join(self._hypothesis_words[self._stable_count:])
+
+    def _transcribe(self, audio_data):
+        peak = np.max(np.abs(audio_data)) if len(audio_data) else 0
+        if peak == 0:
+            return []
+        text = transcribe_audio(
+            self.processor, self.model, self.device, audio_data / peak, self.language,
+            use_cache=False
+        )
+        return (text or "").split()
+
+    def _update_hypothesis(self):
+        words = self._transcribe(self._buffer)
+        
+        # Local agreement: the common prefix of consecutive hypotheses is stable
+        agreed = 0
+        for previous, current in zip(self._hypothesis_words, words):
+            if previous != current:
+                break
+            agreed += 1
+        
+        self._stable_count = agreed
+        self._hypothesis_words = words
+
+    def _finalize_prefix(self):
+        # Cut at the quietest 100 ms frame in the last 3 s before the buffer
+        # limit to avoid splitting words
+        frame = self.SAMPLE_RATE // 10
+        search_end = min(len(self._buffer), self.max_buffer_samples)
+        search_start = max(0, search_end - 3 * self.SAMPLE_RATE)
+        tail = self._buffer[search_start:search_end]
+        num_frames = max(1, len(tail) // frame)
+        energies = [np.mean(tail[i * frame:(i + 1) * frame] ** 2) for i in range(num_frames)]
+        cut = search_start + int(np.argmin(energies)) * frame + frame // 2
+        
+        self._final_words.extend(self._transcribe(self._buffer[:cut]))
+        self._buffer = self._buffer[cut:]
+        self._hypothesis_words = []
+        self._stable_count = 0
+
 def create_transcription_item(transcription, selected_language, user_name):
     """Create a new transcription item with metadata"""
     timestamp = datetime.datetime.now().strftime("%Y-%m-%d %H:%M:%S")
@@ -427,46 +1945,323 @@ def create_transcription_item(transcription, selected_language, user_name):
     
     return transcription_item
 
-def copy_transcription(index, transcription_history):
-    """Get a specific transcription text for copying"""
-    if 0 <= index < len(transcription_history):
-        return transcription_history[index]["transcription"]
-    return None
+# Saved transcriptions live in SQLite instead of session state, so they
+# outlive the session and only the page being shown is held in memory. The
+# database itself must be on a local disk (WAL needs shared memory, which
+# network filesystems don't provide). KASUKU_HISTORY_BACKUP_DIR names a
+# shared folder, e.g. on a mounted volume: every replica copies its database
+# there a few seconds after writes and periodically merges in the copies of
+# the other replicas, so any number of replicas can serve the history.
+HISTORY_DB_PATH = os.getenv("KASUKU_HISTORY_DB", str(Path.home() / ".cache" / "kasuku" / "history.sqlite3"))
+HISTORY_BACKUP_DIR = os.getenv("KASUKU_HISTORY_BACKUP_DIR", "")
+HISTORY_BACKUP_DELAY = float(os.getenv("KASUKU_HISTORY_BACKUP_DELAY", "5"))
+HISTORY_SYNC_INTERVAL = float(os.getenv("KASUKU_HISTORY_SYNC_INTERVAL", "30"))
+# Copies not updated for this long belong to replicas that are gone; they
+# are deleted once merged
+HISTORY_REPLICA_TTL = float(os.getenv("KASUKU_HISTORY_REPLICA_TTL_HOURS", "24")) * 3600
+HISTORY_REPLICA = os.getenv("KASUKU_HISTORY_REPLICA") or uuid.uuid4().hex[:12]
+HISTORY_PAGE_SIZE = int(os.getenv("KASUKU_HISTORY_PAGE_SIZE", "50"))
 
-def delete_transcription(index, transcription_history):
-    """Delete a transcription by index"""
-    if 0 <= index < len(transcription_history):
-        deleted_item = transcription_history.pop(index)
-        return True, deleted_item
-    return False, None
+# Called after every backup, e.g. to commit the volume it was written to,
+# and before every sync, e.g. to reload it
+_history_backup_hooks = []
+_history_sync_hooks = []
 
-def filter_transcriptions(transcription_history, search_query=None, language_filter="All"):
-    """Filter transcriptions based on search query and language filter"""
-    filtered_history = [(i, item) for i, item in enumerate(transcription_history)]
+def on_history_backup(callback):
+    """Register a callable to run after each history backup"""
+    _history_backup_hooks.append(callback)
+
+def on_history_sync(callback):
+    """Register a callable to run before the other replicas' copies are merged"""
+    _history_sync_hooks.append(callback)
+
+def _run_history_hooks(hooks):
+    for callback in hooks:
+        try:
+            callback()
+        except Exception as e:
+            print(f"History hook {getattr(callback, '__name__', callback)} failed: {e}")
+
+class TranscriptionStore:
+    """
+    Saved transcriptions partitioned by owner (the signed-in user's email)
+    and keyed by the item id from create_transcription_item. The database
+    runs in WAL mode, so sessions keep reading while another one appends;
+    every thread gets its own connection.
     
-    if search_query:
-        filtered_history = [
-            (i, item) for i, item in filtered_history 
-            if search_query.lower() in item["transcription"].lower()
-        ]
+    With a backup_dir, the database is copied there as this replica's file
+    (debounced by backup_delay seconds) with SQLite's online backup, and
+    every sync_interval seconds the other replicas' files are merged in.
+    Items are keyed by id and deletions leave a tombstone, so merges never
+    bring a deleted item back; the history is ordered by timestamp.
+    """
     
-    if language_filter != "All":
-        filtered_history = [
-            (i, item) for i, item in filtered_history 
-            if item["language"] == language_filter
-        ]
+    FIELDS = ("id", "timestamp", "language", "transcription", "user")
+    
+    def __init__(self, path=None, backup_dir=None, backup_delay=None, sync_interval=None, replica=None):
+        self.path = path or HISTORY_DB_PATH
+        self.backup_dir = HISTORY_BACKUP_DIR if backup_dir is None else backup_dir
+        self.backup_delay = HISTORY_BACKUP_DELAY if backup_delay is None else backup_delay
+        self.sync_interval = HISTORY_SYNC_INTERVAL if sync_interval is None else sync_interval
+        self.replica = replica or HISTORY_REPLICA
+        Path(self.path).parent.mkdir(parents=True, exist_ok=True)
+        self._local = threading.local()
+        self._backup_lock = threading.Lock()
+        self._backup_timer = None
+        self._sync_lock = threading.Lock()
+        self._merged = {}   # replica file name -> mtime when it was merged
+        with self._connection() as db:
+            db.executescript("""
+                CREATE TABLE IF NOT EXISTS transcriptions (
+                    seq INTEGER PRIMARY KEY AUTOINCREMENT,
+                    id TEXT NOT NULL UNIQUE,
+                    owner TEXT NOT NULL,
+                    timestamp TEXT NOT NULL,
+                    language TEXT NOT NULL,
+                    transcription TEXT NOT NULL,
+                    user TEXT
+                );
+                CREATE INDEX IF NOT EXISTS transcriptions_by_owner_time
+                    ON transcriptions (owner, timestamp, seq);
+                CREATE INDEX IF NOT EXISTS transcriptions_by_owner_language_time
+                    ON transcriptions (owner, language, timestamp, seq);
+                CREATE TABLE IF NOT EXISTS deleted (
+                    id TEXT PRIMARY KEY,
+                    owner TEXT NOT NULL
+                );
+            """)
+        
+        if self.backup_dir:
+            Path(self.backup_dir).mkdir(parents=True, exist_ok=True)
+            self.sync()
+            atexit.register(self.backup)
+            if self.sync_interval > 0:
+                threading.Thread(target=self._sync_loop, name="kasuku-history-sync", daemon=True).start()
+    
+    def _connection(self):
+        import sqlite3
+        
+        db = getattr(self._local, "db", None)
+        if db is None:
+            db = sqlite3.connect(self.path, timeout=10)
+            db.row_factory = sqlite3.Row
+            # SQLite's lower() only folds ASCII
+            db.create_function("casefold", 1, str.casefold, deterministic=True)
+            db.execute("PRAGMA journal_mode=WAL")
+            db.execute("PRAGMA synchronous=NORMAL")
+            self._local.db = db
+        return db
+    
+    @staticmethod
+    def _copy_database(source, target):
+        """Consistent copy of a (possibly live) database, replacing target atomically"""
+        import sqlite3
+        
+        Path(target).parent.mkdir(parents=True, exist_ok=True)
+        tmp_target = f"{target}.tmp"
+        src = sqlite3.connect(source)
+        dst = sqlite3.connect(tmp_target)
+        try:
+            src.backup(dst)
+            # The copy is a plain rollback-journal file, safe to keep anywhere
+            dst.execute("PRAGMA journal_mode=DELETE")
+        finally:
+            dst.close()
+            src.close()
+        os.replace(tmp_target, target)
+    
+    @property
+    def backup_path(self):
+        """This replica's copy in backup_dir"""
+        return str(Path(self.backup_dir) / f"history-{self.replica}.sqlite3")
+    
+    def backup(self):
+        """Copy the database to this replica's file in backup_dir now (a no-op without one)"""
+        if not self.backup_dir:
+            return
+        with self._backup_lock:
+            if self._backup_timer is not None:
+                self._backup_timer.cancel()
+                self._backup_timer = None
+            self._copy_database(self.path, self.backup_path)
+        _run_history_hooks(_history_backup_hooks)
+    
+    def sync(self):
+        """
+        Merge the other replicas' files in backup_dir that changed since the
+        last sync. Returns how many files were merged.
+        """
+        if not self.backup_dir:
+            return 0
+        with self._sync_lock:
+            _run_history_hooks(_history_sync_hooks)
+            merged, stale = 0, []
+            for replica_file in sorted(Path(self.backup_dir).glob("history-*.sqlite3")):
+                if str(replica_file) == self.backup_path:
+                    continue
+                try:
+                    mtime = replica_file.stat().st_mtime
+                    if self._merged.get(replica_file.name) != mtime:
+                        self._merge(replica_file)
+                        self._merged[replica_file.name] = mtime
+                        merged += 1
+                except Exception as e:
+                    print(f"Could not merge transcription history from {replica_file}: {e}")
+                    continue
+                if time.time() - mtime > HISTORY_REPLICA_TTL:
+                    stale.append(replica_file)
+            
+            if not merged and not stale:
+                return 0
+            # Everything merged is in this replica's file before any other file goes
+            self.backup()
+            for replica_file in stale:
+                try:
+                    replica_file.unlink()
+                    self._merged.pop(replica_file.name, None)
+                except OSError:
+                    pass
+            if stale:
+                _run_history_hooks(_history_backup_hooks)
+            return merged
+    
+    def _merge(self, replica_file):
+        # Work on a local copy, never on a file another replica may replace
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            copy = str(Path(tmp_dir) / "replica.sqlite3")
+            self._copy_database(str(replica_file), copy)
+            db = self._connection()
+            db.execute("ATTACH DATABASE ? AS replica", (copy,))
+            try:
+                with db:
+                    db.execute("INSERT OR IGNORE INTO deleted (id, owner) SELECT id, owner FROM replica.deleted")
+                    db.execute(
+                        "INSERT OR IGNORE INTO transcriptions (id, owner, timestamp, language, transcription, user) "
+                        "SELECT id, owner, timestamp, language, transcription, user FROM replica.transcriptions "
+                        "WHERE id NOT IN (SELECT id FROM deleted) ORDER BY seq"
+                    )
+                    db.execute("DELETE FROM transcriptions WHERE id IN (SELECT id FROM deleted)")
+            finally:
+                db.execute("DETACH DATABASE replica")
+    
+    def _sync_loop(self):
+        while True:
+            time.sleep(self.sync_interval)
+            try:
+                self.sync()
+            except Exception as e:
+                print(f"Transcription history sync failed: {e}")
+    
+    def _changed(self):
+        """Schedule a backup after a write, coalescing bursts of writes"""
+        if not self.backup_dir:
+            return
+        with self._backup_lock:
+            if self._backup_timer is None:
+                self._backup_timer = threading.Timer(self.backup_delay, self.backup)
+                self._backup_timer.daemon = True
+                self._backup_timer.start()
+    
+    def _item(self, row):
+        return {field: row[field] for field in self.FIELDS}
     
-    return filtered_history
+    def _where(self, owner, search_query=None, language_filter="All"):
+        clauses, params = ["owner = ?"], [owner]
+        if search_query:
+            clauses.append("instr(casefold(transcription), casefold(?)) > 0")
+            params.append(search_query)
+        if language_filter and language_filter != "All":
+            clauses.append("language = ?")
+            params.append(language_filter)
+        return " AND ".join(clauses), params
+    
+    def add(self, owner, item):
+        """Append a transcription item for owner"""
+        with self._connection() as db:
+            db.execute(
+                "INSERT INTO transcriptions (id, owner, timestamp, language, transcription, user) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                (item["id"], owner, item["timestamp"], item["language"], item["transcription"], item.get("user"))
+            )
+        self._changed()
+        return item
+    
+    def get(self, owner, transcription_id):
+        row = self._connection().execute(
+            "SELECT * FROM transcriptions WHERE owner = ? AND id = ?", (owner, transcription_id)
+        ).fetchone()
+        return self._item(row) if row else None
+    
+    def delete(self, owner, transcription_id):
+        """Delete one of owner's transcriptions by id; returns the deleted item or None"""
+        with self._connection() as db:
+            row = db.execute(
+                "SELECT * FROM transcriptions WHERE owner = ? AND id = ?", (owner, transcription_id)
+            ).fetchone()
+            if row is None:
+                return None
+            db.execute("INSERT OR IGNORE INTO deleted (id, owner) VALUES (?, ?)", (row["id"], owner))
+            db.execute("DELETE FROM transcriptions WHERE seq = ?", (row["seq"],))
+        self._changed()
+        return self._item(row)
+    
+    def clear(self, owner):
+        """Delete all of owner's transcriptions; returns how many there were"""
+        with self._connection() as db:
+            db.execute("INSERT OR IGNORE INTO deleted (id, owner) SELECT id, owner FROM transcriptions WHERE owner = ?",
+                       (owner,))
+            deleted = db.execute("DELETE FROM transcriptions WHERE owner = ?", (owner,)).rowcount
+        self._changed()
+        return deleted
+    
+    def count(self, owner, search_query=None, language_filter="All"):
+        where, params = self._where(owner, search_query, language_filter)
+        return self._connection().execute(f"SELECT COUNT(*) FROM transcriptions WHERE {where}", params).fetchone()[0]
+    
+    def query(self, owner, search_query=None, language_filter="All", limit=None, offset=0):
+        """owner's transcriptions matching the filters, newest first"""
+        where, params = self._where(owner, search_query, language_filter)
+        sql = f"SELECT * FROM transcriptions WHERE {where} ORDER BY timestamp DESC, seq DESC"
+        if limit is not None:
+            sql += " LIMIT ? OFFSET ?"
+            params += [limit, offset]
+        return [self._item(row) for row in self._connection().execute(sql, params)]
+
+@st.cache_resource
+def get_history_store():
+    """Process-wide transcription history store"""
+    return TranscriptionStore()
 
-def save_transcription_to_history(transcription, selected_language, user_name, transcription_history):
+def copy_transcription(transcription_id, owner):
+    """Get a specific transcription text for copying"""
+    item = get_history_store().get(owner, transcription_id)
+    return item["transcription"] if item else None
+
+def delete_transcription(transcription_id, owner):
+    """Delete a transcription by id"""
+    deleted_item = get_history_store().delete(owner, transcription_id)
+    return deleted_item is not None, deleted_item
+
+def filter_transcriptions(owner, search_query=None, language_filter="All", limit=None, offset=0):
+    """Filter owner's transcriptions by search query and language, newest first"""
+    return get_history_store().query(owner, search_query, language_filter, limit, offset)
+
+def count_transcriptions(owner, search_query=None, language_filter="All"):
+    """Number of owner's transcriptions matching the filters"""
+    return get_history_store().count(owner, search_query, language_filter)
+
+def clear_transcriptions(owner):
+    """Delete all of owner's transcriptions"""
+    return get_history_store().clear(owner)
+
+def save_transcription_to_history(transcription, selected_language, user_name, owner):
     """Save a transcription to history with proper item creation"""
     transcription_item = create_transcription_item(
         transcription, 
         selected_language, 
         user_name
     )
-    transcription_history.append(transcription_item)
-    return transcription_history
+    return get_history_store().add(owner, transcription_item)
 
 # Google Cloud TTS Functions with Environment Variable Support
 
@@ -653,25 +2448,589 @@ def cleanup_temp_credentials():
 # Register cleanup function to run when the program exits
 atexit.register(cleanup_temp_credentials)
 
-# Setup Google Cloud credentials
-CREDENTIALS_FILE = setup_google_credentials()
+_google_tts = None
+_google_tts_lock = threading.Lock()
+
+def get_google_tts():
+    """
+    Set up Google Cloud credentials and import the TTS library on first use
+    instead of at import time. Returns (credentials_file, texttospeech),
+    where either is None if it isn't available.
+    """
+    global _google_tts
+    with _google_tts_lock:
+        if _google_tts is None:
+            credentials_file = setup_google_credentials()
+            texttospeech = None
+            if not credentials_file:
+                print("Warning: Google Cloud credentials not configured")
+            else:
+                try:
+                    from google.cloud import texttospeech
+                    print("Google Cloud TTS initialized successfully")
+                except ImportError:
+                    print("Google Cloud TTS not installed. Install with: pip install google-cloud-texttospeech")
+            _google_tts = (credentials_file, texttospeech)
+        return _google_tts
+
+# Speech engines turn one chunk of text into audio; TTSClientPool adds
+# worker threads, caching and request sharing on top. KASUKU_TTS_ENGINE picks
+# the engine: "google" (Google Cloud) or "espeak" (espeak-ng, offline).
+# KASUKU_TTS_FALLBACK names an engine that answers instead when the primary
+# one fails or takes longer than KASUKU_TTS_FALLBACK_TIMEOUT seconds.
+TTS_ENGINE = os.getenv("KASUKU_TTS_ENGINE", "google").lower()
+TTS_FALLBACK_ENGINE = os.getenv("KASUKU_TTS_FALLBACK", "").lower()
+TTS_FALLBACK_TIMEOUT = float(os.getenv("KASUKU_TTS_FALLBACK_TIMEOUT", "5"))
+TTS_MIMETYPES = {"mp3": "audio/mpeg", "wav": "audio/wav"}
+
+# At most TTS_MAX_CONCURRENCY requests run at once per process;
+# KASUKU_TTS_ENDPOINT (e.g. http://127.0.0.1:8090) points the Google clients
+# at a local fake server (fake_tts_server.py) with anonymous credentials over
+# REST instead of Google.
+TTS_MAX_CONCURRENCY = int(os.getenv("KASUKU_TTS_CONCURRENCY", "4"))
+TTS_ENDPOINT = os.getenv("KASUKU_TTS_ENDPOINT", "").rstrip("/")
+TTS_TIMEOUT = float(os.getenv("KASUKU_TTS_TIMEOUT", "30"))
+# Refresh the access token this long before it expires, outside any request
+TTS_TOKEN_REFRESH_MARGIN = datetime.timedelta(minutes=5)
+TTS_SCOPES = ["https://www.googleapis.com/auth/cloud-platform"]
+
+# Long texts are synthesized as sentence-aligned chunks in parallel. Google
+# accepts at most 5000 bytes per request; the first chunk is kept short so
+# playback can start as soon as it is ready.
+TTS_CHUNK_BYTES = int(os.getenv("KASUKU_TTS_CHUNK_BYTES", "1000"))
+TTS_FIRST_CHUNK_BYTES = int(os.getenv("KASUKU_TTS_FIRST_CHUNK_BYTES", "200"))
+
+_SENTENCE_END = re.compile(r"(?<=[.!?…])\s+")
+_CLAUSE_END = re.compile(r"(?<=[,;:])\s+")
+
+def _pack_pieces(pieces, max_bytes, first_max_bytes=None, separator=" "):
+    """Greedily join pieces into chunks of at most max_bytes (UTF-8)"""
+    chunks = []
+    current = ""
+    for piece in pieces:
+        limit = first_max_bytes if first_max_bytes and not chunks else max_bytes
+        candidate = f"{current}{separator}{piece}" if current else piece
+        if current and len(candidate.encode("utf-8")) > limit:
+            chunks.append(current)
+            current = piece
+        else:
+            current = candidate
+    if current:
+        chunks.append(current)
+    return chunks
+
+def _split_long_sentence(sentence, max_bytes):
+    """Split one over-long sentence at clause breaks, then between words"""
+    pieces = []
+    for clause in _CLAUSE_END.split(sentence):
+        if len(clause.encode("utf-8")) <= max_bytes:
+            pieces.append(clause)
+            continue
+        for words in _pack_pieces(clause.split(), max_bytes):
+            # A single "word" longer than the limit is cut by characters
+            while len(words.encode("utf-8")) > max_bytes:
+                cut = len(words.encode("utf-8")[:max_bytes].decode("utf-8", "ignore"))
+                pieces.append(words[:cut])
+                words = words[cut:]
+            pieces.append(words)
+    return _pack_pieces(pieces, max_bytes)
+
+def split_tts_text(text, max_bytes=None, first_chunk_bytes=None):
+    """
+    Split text into chunks for synthesis without breaking sentences unless a
+    single sentence is over max_bytes. The first chunk is limited to
+    first_chunk_bytes (but always holds at least one sentence).
+    """
+    max_bytes = max_bytes or TTS_CHUNK_BYTES
+    first_chunk_bytes = first_chunk_bytes or TTS_FIRST_CHUNK_BYTES
+    
+    pieces = []
+    for sentence in _SENTENCE_END.split(" ".join(text.split())):
+        if not sentence:
+            continue
+        if len(sentence.encode("utf-8")) <= max_bytes:
+            pieces.append(sentence)
+        else:
+            pieces.extend(_split_long_sentence(sentence, max_bytes))
+    return _pack_pieces(pieces, max_bytes, first_max_bytes=min(first_chunk_bytes, max_bytes))
+
+def _google_voice(language, gender):
+    """Google language code and voice name for a language and gender"""
+    lang_code = "en-US" if language == "en" else "sw-KE"
+    
+    if language == "en":
+        # English Wavenet voices are stable
+        if gender == "Male":
+            voice_name = "en-US-Chirp3-HD-Iapetus"
+        else:
+            voice_name = "en-US-Chirp3-HD-Leda"
+    else:  # Swahili
+        if gender == "Male":
+            voice_name = "sw-KE-Chirp3-HD-Iapetus"  # Male (Standard)
+        else:
+            voice_name = "sw-KE-Chirp3-HD-Leda"  # Female (Standard)
+    return lang_code, voice_name
+
+# Synthesized audio is cached on disk (shared by restarts, and by replicas
+# when the folder is on a shared volume) with a small in-memory tier on top
+TTS_CACHE_DIR = os.getenv("KASUKU_TTS_CACHE_DIR", str(Path.home() / ".cache" / "kasuku" / "tts"))
+TTS_CACHE_MAX_MB = float(os.getenv("KASUKU_TTS_CACHE_MAX_MB", "256"))
+TTS_CACHE_MEMORY_MB = float(os.getenv("KASUKU_TTS_CACHE_MEMORY_MB", "32"))
+
+def tts_cache_key(text, language, voice_name, audio_encoding="MP3"):
+    """Content address of synthesized audio: text digest plus voice settings"""
+    text_digest = hashlib.blake2b(text.encode("utf-8"), digest_size=32).hexdigest()
+    settings = json.dumps([text_digest, language, voice_name, audio_encoding])
+    return hashlib.blake2b(settings.encode("utf-8"), digest_size=32).hexdigest()
+
+class TTSAudioCache(ContentAddressedCache):
+    """
+    Content-addressed cache of synthesized audio bytes. The memory tier is
+    bounded by max_memory_bytes; on disk each clip is one raw audio file.
+    """
+    
+    def __init__(self, cache_dir=None, max_disk_bytes=int(TTS_CACHE_MAX_MB * 1024 * 1024),
+                 max_memory_bytes=int(TTS_CACHE_MEMORY_MB * 1024 * 1024), suffix=".mp3"):
+        super().__init__(cache_dir=cache_dir, max_disk_bytes=max_disk_bytes,
+                         max_memory_bytes=max_memory_bytes, suffix=suffix, name="TTS cache")
+
+@st.cache_resource
+def get_tts_cache():
+    """Process-wide synthesized audio cache"""
+    return TTSAudioCache(cache_dir=TTS_CACHE_DIR or None)
+
+class GoogleTTSEngine:
+    """
+    Google Cloud TTS. Long-lived TextToSpeechClient objects (and their
+    channels) are reused across requests, one set of credentials is
+    refreshed ahead of expiry for all of them, and at most max_clients calls
+    are in flight.
+    """
+    
+    name = "google-cloud"
+    audio_format = "mp3"
+    
+    def __init__(self, endpoint=None, timeout=None, max_clients=None):
+        self.endpoint = TTS_ENDPOINT if endpoint is None else endpoint
+        self.timeout = timeout or TTS_TIMEOUT
+        self._idle = []             # clients not currently in use
+        self._slots = threading.BoundedSemaphore(max_clients or TTS_MAX_CONCURRENCY)
+        self._lock = threading.Lock()
+        self._credentials = None
+        self._stats = {"clients_created": 0, "token_refreshes": 0}
+    
+    def voice(self, language, gender):
+        """(language_code, voice_name) used for language and gender"""
+        return _google_voice(language, gender)
+    
+    def _texttospeech(self):
+        if self.endpoint:
+            from google.cloud import texttospeech
+            return texttospeech
+        credentials_file, texttospeech = get_google_tts()
+        if not credentials_file:
+            raise RuntimeError("Google Cloud credentials not configured.")
+        if texttospeech is None:
+            raise RuntimeError("Google Cloud TTS library not installed.")
+        return texttospeech
+    
+    def _get_credentials(self):
+        with self._lock:
+            if self._credentials is None:
+                if self.endpoint:
+                    from google.auth.credentials import AnonymousCredentials
+                    self._credentials = AnonymousCredentials()
+                else:
+                    import google.auth
+                    credentials_file, _ = get_google_tts()
+                    self._credentials, _ = google.auth.load_credentials_from_file(
+                        credentials_file, scopes=TTS_SCOPES
+                    )
+            return self._credentials
+    
+    def _refresh_token(self, force=False):
+        """Refresh the shared access token if it is missing or about to expire"""
+        credentials = self._get_credentials()
+        if self.endpoint:
+            return
+        with self._lock:
+            expiry = getattr(credentials, "expiry", None)
+            expiring = expiry is not None and expiry - datetime.datetime.utcnow() < TTS_TOKEN_REFRESH_MARGIN
+            if force or not credentials.valid or expiring:
+                import google.auth.transport.requests
+                credentials.refresh(google.auth.transport.requests.Request())
+                self._stats["token_refreshes"] += 1
+    
+    def _new_client(self):
+        texttospeech = self._texttospeech()
+        kwargs = {"credentials": self._get_credentials()}
+        if self.endpoint:
+            from google.api_core.client_options import ClientOptions
+            kwargs.update(transport="rest", client_options=ClientOptions(api_endpoint=self.endpoint))
+        with self._lock:
+            self._stats["clients_created"] += 1
+        return texttospeech.TextToSpeechClient(**kwargs)
+    
+    def _checkout(self):
+        self._slots.acquire()
+        try:
+            with self._lock:
+                if self._idle:
+                    return self._idle.pop()
+            return self._new_client()
+        except Exception:
+            self._slots.release()
+            raise
+    
+    def _checkin(self, client, healthy=True):
+        # A client whose call failed is dropped so its channel is rebuilt
+        if healthy:
+            with self._lock:
+                self._idle.append(client)
+        self._slots.release()
+    
+    def synthesize(self, text, language="en", gender="Female", timeout=None):
+        """MP3 bytes for text, blocking the calling thread"""
+        texttospeech = self._texttospeech()
+        lang_code, voice_name = self.voice(language, gender)
+        request = {
+            "input": texttospeech.SynthesisInput(text=text),
+            "voice": texttospeech.VoiceSelectionParams(language_code=lang_code, name=voice_name),
+            "audio_config": texttospeech.AudioConfig(audio_encoding=texttospeech.AudioEncoding.MP3),
+        }
+        
+        for attempt in range(2):
+            self._refresh_token(force=attempt > 0)
+            client = self._checkout()
+            try:
+                response = client.synthesize_speech(**request, timeout=timeout or self.timeout)
+            except Exception as e:
+                self._checkin(client, healthy=False)
+                # Retry once with a fresh token if the old one was rejected
+                from google.api_core import exceptions as google_exceptions
+                if attempt == 0 and isinstance(e, google_exceptions.Unauthenticated):
+                    continue
+                raise
+            self._checkin(client)
+            return response.audio_content
+    
+    def stats(self):
+        with self._lock:
+            return {**self._stats, "idle_clients": len(self._idle)}
+    
+    def close(self):
+        with self._lock:
+            idle, self._idle = self._idle, []
+        for client in idle:
+            try:
+                client.transport.close()
+            except Exception:
+                pass
+
+class EspeakTTSEngine:
+    """
+    Offline synthesis with the espeak-ng command line tool (apt install
+    espeak-ng). It sounds robotic next to Google, but needs no credentials
+    or network and answers in milliseconds, which makes it a load-test
+    target and a fallback for when the API is slow.
+    """
+    
+    name = "espeak-ng"
+    audio_format = "wav"
+    VOICES = {"en": "en-us", "sw": "sw"}
+    VARIANTS = {"Female": "f3", "Male": "m3"}
+    
+    def __init__(self, executable=None, timeout=None, words_per_minute=160):
+        import shutil
+        
+        self.executable = executable or shutil.which("espeak-ng") or shutil.which("espeak")
+        self.timeout = timeout or TTS_TIMEOUT
+        self.words_per_minute = words_per_minute
+        self._lock = threading.Lock()
+        self._stats = {"processes": 0}
+    
+    def voice(self, language, gender):
+        """(language_code, voice_name) used for language and gender"""
+        lang_code = self.VOICES.get(language, "sw")
+        return lang_code, f"{lang_code}+{self.VARIANTS.get(gender, 'f3')}"
+    
+    def synthesize(self, text, language="en", gender="Female", timeout=None):
+        """WAV bytes for text, blocking the calling thread"""
+        import subprocess
+        
+        if not self.executable:
+            raise RuntimeError("espeak-ng not installed. Install with: apt install espeak-ng")
+        _, voice_name = self.voice(language, gender)
+        with self._lock:
+            self._stats["processes"] += 1
+        
+        # Text goes in on stdin (so it can't be mistaken for options) and the
+        # WAV goes to a file, which gets a proper header unlike --stdout
+        with tempfile.NamedTemporaryFile(suffix=".wav", delete=False) as f:
+            wav_path = f.name
+        try:
+            subprocess.run(
+                [self.executable, "-b", "1", "-v", voice_name, "-s", str(self.words_per_minute), "-w", wav_path],
+                input=text.encode("utf-8"), capture_output=True, check=True,
+                timeout=timeout or self.timeout
+            )
+            with open(wav_path, "rb") as f:
+                return f.read()
+        finally:
+            os.unlink(wav_path)
+    
+    def stats(self):
+        with self._lock:
+            return dict(self._stats)
+    
+    def close(self):
+        pass
+
+TTS_ENGINES = {
+    "google": GoogleTTSEngine,
+    "espeak": EspeakTTSEngine,
+}
+
+def create_tts_engine(engine=None):
+    """Speech engine by name ("google" or "espeak"), TTS_ENGINE by default"""
+    engine = engine or TTS_ENGINE
+    if engine not in TTS_ENGINES:
+        raise ValueError(f"Unknown TTS engine '{engine}', expected one of {sorted(TTS_ENGINES)}")
+    return TTS_ENGINES[engine]()
+
+class TTSClientPool:
+    """
+    Process-wide front end to the speech engine, shared by every session.
+    Concurrency is bounded, identical requests in flight share one call,
+    audio is cached, and when the engine fails or is too slow the fallback
+    engine (if any) answers instead. submit() runs synthesis on a worker
+    thread so the script thread never waits on the engine.
+    """
+    
+    def __init__(self, engine=None, fallback=None, max_concurrency=None, cache=None,
+                 fallback_timeout=None):
+        from concurrent.futures import ThreadPoolExecutor
+        
+        self.engine = engine if engine is not None else create_tts_engine()
+        if fallback is None and TTS_FALLBACK_ENGINE:
+            fallback = create_tts_engine(TTS_FALLBACK_ENGINE)
+        self.fallback = fallback
+        self.fallback_timeout = fallback_timeout or TTS_FALLBACK_TIMEOUT
+        self.max_concurrency = max_concurrency or TTS_MAX_CONCURRENCY
+        self._lock = threading.Lock()
+        self._executor = ThreadPoolExecutor(max_workers=self.max_concurrency,
+                                            thread_name_prefix="kasuku-tts")
+        self.cache = cache if cache is not None else TTSAudioCache(cache_dir=None)
+        self._in_flight = {}            # (text, language, gender) -> Future, so repeats share one call
+        self._stats = {"requests": 0, "synthesized": 0, "errors": 0, "fallbacks": 0}
+    
+    def cache_key(self, text, language="en", gender="Female", engine=None):
+        """TTS cache key of one chunk of text as synthesized by engine (the primary one by default)"""
+        engine = engine or self.engine
+        lang_code, voice_name = engine.voice(language, gender)
+        return tts_cache_key(text, lang_code, voice_name, engine.audio_format.upper())
+    
+    def _synthesize_with(self, engine, text, language, gender, timeout=None):
+        key = self.cache_key(text, language, gender, engine)
+        audio_content = self.cache.get(key)
+        if audio_content is None:
+            audio_content = engine.synthesize(text, language, gender, timeout=timeout)
+            self.cache.put(key, audio_content)
+            with self._lock:
+                self._stats["synthesized"] += 1
+        return {"key": key, "audio": audio_content, "format": engine.audio_format, "engine": engine.name}
+    
+    def synthesize(self, text, language="en", gender="Female"):
+        """
+        Synthesize one chunk of text (or fetch it from the cache), blocking
+        the calling thread. Returns {"key", "audio", "format", "engine"},
+        where key is the chunk's TTS cache key.
+        """
+        with self._lock:
+            self._stats["requests"] += 1
+        try:
+            return self._synthesize_with(self.engine, text, language, gender,
+                                         timeout=self.fallback_timeout if self.fallback else None)
+        except Exception as e:
+            with self._lock:
+                self._stats["errors"] += 1
+            if self.fallback is None:
+                raise
+            print(f"{self.engine.name} TTS failed ({str(e)[:100]}), using {self.fallback.name}")
+            with self._lock:
+                self._stats["fallbacks"] += 1
+            return self._synthesize_with(self.fallback, text, language, gender)
+    
+    def synthesize_fallback(self, text, language="en", gender="Female"):
+        """Synthesize one chunk with the fallback engine, to match chunks it already answered"""
+        return self._synthesize_with(self.fallback, text, language, gender)
+    
+    def submit(self, text, language="en", gender="Female"):
+        """Start synthesis on a worker thread; returns a Future of synthesize()'s result"""
+        key = (text, language, gender)
+        with self._lock:
+            future = self._in_flight.get(key)
+            if future is not None:
+                return future
+            future = self._executor.submit(self.synthesize, text, language, gender)
+            self._in_flight[key] = future
+        
+        def forget(done):
+            with self._lock:
+                if self._in_flight.get(key) is done:
+                    del self._in_flight[key]
+        future.add_done_callback(forget)
+        return future
+    
+    def submit_chunks(self, text, language="en", gender="Female"):
+        """
+        Split text with split_tts_text and start every chunk at once (up to
+        the concurrency limit, in order). Returns one Future per chunk, in
+        playback order.
+        """
+        return [self.submit(chunk, language, gender) for chunk in split_tts_text(text)]
+    
+    def stats(self):
+        with self._lock:
+            stats = {**self._stats, "in_flight": len(self._in_flight)}
+        stats["engines"] = {engine.name: engine.stats() for engine in (self.engine, self.fallback) if engine}
+        stats["cache"] = self.cache.stats()
+        return stats
+    
+    def close(self):
+        self._executor.shutdown(wait=False, cancel_futures=True)
+        for engine in (self.engine, self.fallback):
+            if engine:
+                engine.close()
+
+@st.cache_resource
+def get_tts_pool():
+    """Process-wide TTS pool on the configured engine, backed by the shared audio cache"""
+    return TTSClientPool(cache=get_tts_cache())
+
+# Speculative synthesis of a transcription as soon as it is shown, so the
+# speak click plays from the cache. Off by default since it pays for speech
+# nobody may listen to; spending is capped at TTS_PREFETCH_CHARS_PER_MINUTE
+# characters per process and TTS_PREFETCH_MAX_CHARS per transcription.
+TTS_PREFETCH = os.getenv("KASUKU_TTS_PREFETCH", "0") == "1"
+TTS_PREFETCH_CHARS_PER_MINUTE = float(os.getenv("KASUKU_TTS_PREFETCH_CHARS_PER_MINUTE", "5000"))
+TTS_PREFETCH_MAX_CHARS = int(os.getenv("KASUKU_TTS_PREFETCH_MAX_CHARS", "1000"))
+
+class TTSPrefetcher:
+    """
+    Background worker that synthesizes texts ahead of a click through the
+    shared TTS pool. One chunk is in flight at a time so prefetching never
+    crowds out clicks (a click on a chunk being prefetched joins that
+    call), and a token bucket of characters per minute bounds the cost.
+    """
+    
+    def __init__(self, pool, chars_per_minute=None, max_chars=None, max_queued=16):
+        self.pool = pool
+        self.chars_per_minute = chars_per_minute or TTS_PREFETCH_CHARS_PER_MINUTE
+        self.max_chars = max_chars or TTS_PREFETCH_MAX_CHARS
+        self._queue = queue.Queue(maxsize=max_queued)
+        self._lock = threading.Lock()
+        self._tokens = self.chars_per_minute
+        self._refilled = time.monotonic()
+        self._stats = {"queued": 0, "dropped": 0, "synthesized": 0, "cached": 0,
+                       "over_budget": 0, "errors": 0}
+        threading.Thread(target=self._run, name="kasuku-tts-prefetch", daemon=True).start()
+    
+    def _take(self, chars):
+        """Spend chars from the budget if there are enough left"""
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self.chars_per_minute,
+                               self._tokens + (now - self._refilled) * self.chars_per_minute / 60.0)
+            self._refilled = now
+            if chars > self._tokens:
+                return False
+            self._tokens -= chars
+            return True
+    
+    def _count(self, stat):
+        with self._lock:
+            self._stats[stat] += 1
+    
+    def prefetch(self, text, language="en", gender="Female"):
+        """Queue text for synthesis; returns False if the queue is full"""
+        try:
+            self._queue.put_nowait((text, language, gender))
+        except queue.Full:
+            self._count("dropped")
+            return False
+        self._count("queued")
+        return True
+    
+    def _run(self):
+        while True:
+            text, language, gender = self._queue.get()
+            # Chunks as the speak button will request them, up to max_chars
+            spent = 0
+            for chunk in split_tts_text(text):
+                spent += len(chunk)
+                if spent > self.max_chars:
+                    break
+                if self.pool.cache.contains(self.pool.cache_key(chunk, language, gender)):
+                    self._count("cached")
+                    continue
+                if not self._take(len(chunk)):
+                    self._count("over_budget")
+                    break
+                try:
+                    self.pool.submit(chunk, language, gender).result()
+                    self._count("synthesized")
+                except Exception as e:
+                    print(f"TTS prefetch failed: {str(e)[:100]}")
+                    self._count("errors")
+                    break
+    
+    def stats(self):
+        with self._lock:
+            return {**self._stats, "pending": self._queue.qsize(), "budget_chars": int(self._tokens)}
+
+@st.cache_resource
+def get_tts_prefetcher():
+    """Process-wide speech prefetcher on the shared TTS pool"""
+    return TTSPrefetcher(get_tts_pool())
+
+def prefetch_speech(text, language="en", gender="Female"):
+    """
+    Start synthesizing text in the background (when KASUKU_TTS_PREFETCH=1)
+    so a later text_to_speech_stream call is answered from the cache.
+    Returns True if the text was queued.
+    """
+    if not TTS_PREFETCH or not text.strip():
+        return False
+    return get_tts_prefetcher().prefetch(text, language, gender)
+
+def join_audio(chunks):
+    """
+    Concatenate audio clips in order. MP3 frames concatenate as they are;
+    WAV clips (which must share one sample format) are re-wrapped under a
+    single header.
+    """
+    wav = [chunk.startswith(b"RIFF") for chunk in chunks]
+    if not any(wav):
+        return b"".join(chunks)
+    if not all(wav):
+        raise ValueError("Can't join MP3 and WAV audio")
+    
+    import wave
+    buffer = io.BytesIO()
+    with wave.open(buffer, "wb") as writer:
+        for index, chunk in enumerate(chunks):
+            with wave.open(io.BytesIO(chunk), "rb") as reader:
+                if index == 0:
+                    writer.setparams(reader.getparams())
+                writer.writeframes(reader.readframes(reader.getnframes()))
+    return buffer.getvalue()
 
-if not CREDENTIALS_FILE:
-    print("Warning: Google Cloud credentials not configured")
-    GOOGLE_TTS_AVAILABLE = False
-else:
-    try:
-        from google.cloud import texttospeech
-        GOOGLE_TTS_AVAILABLE = True
-        print("Google Cloud TTS initialized successfully")
-    except ImportError:
-        GOOGLE_TTS_AVAILABLE = False
-        print("Google Cloud TTS not installed. Install with: pip install google-cloud-texttospeech")
-
-@st.cache_data(max_entries=50)
 def text_to_speech(text, language="en", gender="Female"):
     """
-    Convert text to speech using Google Cloud TTS (high-quality, online).
+    Convert text to speech with the configured engine (Google Cloud TTS by
+    default). Long texts are synthesized in parallel chunks and joined in
+    order.
     
     Args:
         text (str): Text to convert to speech
@@ -681,60 +3040,200 @@ def text_to_speech(text, language="en", gender="Female"):
     Returns:
         tuple: (audio_base64, tts_engine_used) or (None, None) if failed
     """
-    if not GOOGLE_TTS_AVAILABLE:
-        st.error("Google Cloud TTS library not installed.")
-        return None, None
-    
-    if not CREDENTIALS_FILE:
-        st.error("Google Cloud credentials not configured.")
-        return None, None
-    
     try:
-        # Initialize client
-        client = texttospeech.TextToSpeechClient()
-
-        # Set the text input
-        synthesis_input = texttospeech.SynthesisInput(text=text)
-
-        # Select the voice based on language and gender
-        lang_code = "en-US" if language == "en" else "sw-KE"
-        
-        if language == "en":
-            # English Wavenet voices are stable
-            if gender == "Male":
-                voice_name = "en-US-Chirp3-HD-Iapetus"
-            else:
-                voice_name = "en-US-Chirp3-HD-Leda"
-        else:  # Swahili
-            if gender == "Male":
-                voice_name = "sw-KE-Chirp3-HD-Iapetus"  # Male (Standard)
-            else:
-                voice_name = "sw-KE-Chirp3-HD-Leda"  # Female (Standard)
+        pool = get_tts_pool()
+        chunks = [future.result() for future in pool.submit_chunks(text, language, gender)]
+        if len({chunk["format"] for chunk in chunks}) > 1:
+            # The fallback answered part of the text and MP3 can't be joined
+            # to WAV, so voice the rest with the fallback too
+            chunks = [chunk if chunk["engine"] == pool.fallback.name
+                      else pool.synthesize_fallback(piece, language, gender)
+                      for piece, chunk in zip(split_tts_text(text), chunks)]
+        audio_content = join_audio([chunk["audio"] for chunk in chunks])
+        return base64.b64encode(audio_content).decode(), chunks[-1]["engine"] if chunks else None
+    except Exception as e:
+        st.error(f"Failed to generate speech: {e}")
+        return None, None
 
-        voice = texttospeech.VoiceSelectionParams(
-            language_code=lang_code, name=voice_name
-        )
+def text_to_speech_stream(text, language="en", gender="Female"):
+    """
+    Start synthesis of every chunk of text in the background. Returns a list
+    of Futures, one per chunk in playback order, each resolving to
+    {"key", "audio", "format", "engine"}, so playback can start with the
+    first chunk while the rest are still rendering.
+    """
+    return get_tts_pool().submit_chunks(text, language, gender)
 
-        # Select the audio file type
-        audio_config = texttospeech.AudioConfig(
-            audio_encoding=texttospeech.AudioEncoding.MP3
-        )
+# Bulk synthesis of saved transcriptions. Each worker synthesizes one
+# transcription at a time through the shared pool, so a job has at most
+# TTS_BULK_CONCURRENCY chunks in flight and leaves pool slots for clicks.
+TTS_BULK_CONCURRENCY = int(os.getenv("KASUKU_TTS_BULK_CONCURRENCY", "2"))
+TTS_BULK_RETRIES = int(os.getenv("KASUKU_TTS_BULK_RETRIES", "2"))
 
-        # Perform the text-to-speech request
-        response = client.synthesize_speech(
-            input=synthesis_input, voice=voice, audio_config=audio_config
+class BulkSpeechJob:
+    """
+    Background synthesis of many transcriptions into the TTS cache, with
+    retries (exponential backoff) per chunk, progress reporting, and
+    optionally a zip of one audio file per transcription plus an index.
+    """
+    
+    def __init__(self, items, gender="Female", pool=None, concurrency=None, retries=None,
+                 build_zip=False):
+        self.items = list(items)
+        self.gender = gender
+        self.pool = pool or get_tts_pool()
+        self.concurrency = max(1, concurrency or TTS_BULK_CONCURRENCY)
+        self.retries = TTS_BULK_RETRIES if retries is None else retries
+        self.build_zip = build_zip
+        # Per item, a list of {"key", "format", "engine"} (the audio stays in
+        # the TTS cache) or an error string
+        self.results = [None] * len(self.items)
+        self.zip_bytes = None
+        self._lock = threading.Lock()
+        self._cancelled = threading.Event()
+        self._finished = threading.Event()
+        self._progress = {"done": 0, "failed": 0, "chunks": 0, "retries": 0}
+        self.started = time.time()
+    
+    def start(self):
+        threading.Thread(target=self._run, name="kasuku-tts-bulk", daemon=True).start()
+        return self
+    
+    def cancel(self):
+        self._cancelled.set()
+    
+    @property
+    def finished(self):
+        return self._finished.is_set()
+    
+    def progress(self):
+        """{total, done, failed, chunks, retries, fraction, elapsed, finished}"""
+        with self._lock:
+            progress = dict(self._progress)
+        progress.update(
+            total=len(self.items),
+            fraction=(progress["done"] + progress["failed"]) / len(self.items) if self.items else 1.0,
+            elapsed=time.time() - self.started,
+            finished=self.finished,
         )
-        # Convert audio content (bytes) directly to base64
-        # No more temporary files!
-        audio_base64 = base64.b64encode(response.audio_content).decode()
+        return progress
+    
+    def _synthesize_chunk(self, chunk, language):
+        for attempt in range(self.retries + 1):
+            try:
+                return self.pool.submit(chunk, language, self.gender).result()
+            except Exception:
+                if attempt == self.retries or self._cancelled.is_set():
+                    raise
+                with self._lock:
+                    self._progress["retries"] += 1
+                time.sleep(0.5 * 2 ** attempt)
+    
+    def _synthesize_item(self, index):
+        item = self.items[index]
+        language = "en" if item["language"] == "English" else "sw"
+        try:
+            pieces = split_tts_text(item["transcription"])
+            if not pieces:
+                raise ValueError("Nothing to speak")
+            chunks = []
+            for chunk in pieces:
+                if self._cancelled.is_set():
+                    raise RuntimeError("Cancelled")
+                speech = self._synthesize_chunk(chunk, language)
+                chunks.append({"key": speech["key"], "format": speech["format"], "engine": speech["engine"]})
+                with self._lock:
+                    self._progress["chunks"] += 1
+            self.results[index] = chunks
+            stat = "done"
+        except Exception as e:
+            self.results[index] = str(e)
+            stat = "failed"
+        with self._lock:
+            self._progress[stat] += 1
+    
+    def _run(self):
+        from concurrent.futures import ThreadPoolExecutor
+        
+        try:
+            with ThreadPoolExecutor(max_workers=self.concurrency, thread_name_prefix="kasuku-tts-bulk") as executor:
+                list(executor.map(self._synthesize_item, range(len(self.items))))
+            if self.build_zip and not self._cancelled.is_set():
+                self.zip_bytes = self._zip()
+        finally:
+            self._finished.set()
+    
+    def _chunk_audio(self, item, chunks):
+        """Audio of an item's chunks from the TTS cache, synthesized again if it was evicted"""
+        language = "en" if item["language"] == "English" else "sw"
+        audio = []
+        for piece, chunk in zip(split_tts_text(item["transcription"]), chunks):
+            audio_content = self.pool.cache.get(chunk["key"])
+            if audio_content is None:
+                speech = self._synthesize_chunk(piece, language)
+                chunk.update(key=speech["key"], format=speech["format"], engine=speech["engine"])
+                audio_content = speech["audio"]
+            audio.append(audio_content)
+        return audio
+    
+    def _zip(self):
+        """One audio file per transcription, numbered in list order, plus index.csv"""
+        import csv
+        import zipfile
+        
+        index_rows = [["file", "id", "timestamp", "language", "transcription", "error"]]
+        buffer = io.BytesIO()
+        # Audio is already compressed (MP3) or tiny next to it (WAV), so store
+        with zipfile.ZipFile(buffer, "w", zipfile.ZIP_STORED) as archive:
+            for number, (item, chunks) in enumerate(zip(self.items, self.results), 1):
+                stem = f"{number:03d}_{item['language'].lower()}_{item['timestamp'].replace(':', '').replace(' ', '_')}"
+                if isinstance(chunks, str):
+                    index_rows.append(["", item["id"], item["timestamp"], item["language"], item["transcription"], chunks])
+                    continue
+                try:
+                    audio = self._chunk_audio(item, chunks)
+                except Exception as e:
+                    index_rows.append(["", item["id"], item["timestamp"], item["language"], item["transcription"], str(e)])
+                    continue
+                try:
+                    files = {f"{stem}.{chunks[0]['format']}": join_audio(audio)}
+                except ValueError:
+                    # A fallback engine answered some chunks in another format
+                    files = {f"{stem}_{part:02d}.{chunk['format']}": audio_content
+                             for part, (chunk, audio_content) in enumerate(zip(chunks, audio), 1)}
+                for name, audio_content in files.items():
+                    archive.writestr(name, audio_content)
+                index_rows.append([" ".join(files), item["id"], item["timestamp"], item["language"],
+                                   item["transcription"], ""])
             
-        return audio_base64, "google-cloud"
-        # ------------------------------
+            index_file = io.StringIO()
+            csv.writer(index_file).writerows(index_rows)
+            archive.writestr("index.csv", index_file.getvalue())
+        return buffer.getvalue()
 
-    except Exception as e:
-        print(f"Google Cloud TTS Error: {str(e)}")
-        st.error(f"Failed to generate speech: {e}")
-        return None, None
+def synthesize_history(items, gender="Female", build_zip=False):
+    """
+    Start synthesizing a list of transcription items (e.g. the result of
+    filter_transcriptions) in the background. Returns the started
+    BulkSpeechJob; poll job.progress() and read job.zip_bytes when finished.
+    """
+    return BulkSpeechJob(items, gender=gender, build_zip=build_zip).start()
+
+def speech_media_url(audio_content, coordinates, mimetype="audio/mpeg"):
+    """
+    Register audio with Streamlit's media file manager and return its URL,
+    so the browser fetches it over HTTP (with range requests) instead of
+    receiving it inline over the websocket. Identical bytes share one file.
+    Without a Streamlit runtime a data URI is returned instead.
+    """
+    from streamlit import runtime
+    
+    if not runtime.exists():
+        return f"data:{mimetype};base64,{base64.b64encode(audio_content).decode()}"
+    url = runtime.get_instance().media_file_mgr.add(audio_content, mimetype, coordinates)
+    # Raw HTML doesn't get the server base path prepended like st.audio does
+    base_path = (st.get_option("server.baseUrlPath") or "").strip("/")
+    return f"/{base_path}{url}" if base_path else url
 
 def get_audio_base64(file_path):
     """Convert audio file to base64 for HTML audio player"""
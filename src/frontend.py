@@ -1,15 +1,26 @@
 import streamlit as st
 import random
+import html
+import time
 from st_copy import copy_button
 from streamlit.components.v1 import html as st_html
 
 from backend import (
     authenticate_user, 
     filter_transcriptions, 
+    count_transcriptions,
+    clear_transcriptions,
     delete_transcription,
+    save_transcription_to_history,
+    history_owner,
+    HISTORY_PAGE_SIZE,
     get_audio_base64, 
     cleanup_temp_audio, 
-    text_to_speech  # <-- Google Cloud function
+    text_to_speech_stream,
+    prefetch_speech,
+    synthesize_history,
+    speech_media_url,
+    TTS_MIMETYPES
 )
 # ---------------------------------------------------
 
@@ -673,7 +684,7 @@ def render_sidebar():
             st.rerun()
         
         # History Button
-        history_count = len(st.session_state.transcription_history)
+        history_count = count_transcriptions(current_history_owner())
         history_label = f"Saved Transcriptions ({history_count})" if history_count > 0 else "Saved Transcriptions"
         
         if st.button(
@@ -737,36 +748,46 @@ def render_sidebar():
         st.markdown("##")
         
         if st.button("Logout", type="primary", icon=":material/logout:", use_container_width=True, key="sidebar_logout"):
+            if st.session_state.get('bulk_speech_job') is not None:
+                st.session_state.bulk_speech_job.cancel()
             for key in ['authenticated', 'user_name', 'user_email', 'current_transcription', 
-                       'current_transcription_language', 'current_audio_bytes', 'tts_voice_gender',
-                       'tts_speech_rate', 'tts_voice_pitch', 'tts_engine']:
+                       'current_transcription_language', 'current_audio_digest', 'tts_voice_gender',
+                       'tts_speech_rate', 'tts_voice_pitch', 'tts_engine', 'speech_prefetched', 'bulk_speech_job',
+                       'history_limit',
+                       'ingested_audio', 'ingested_audio_digests', 'models_preloaded']:
                 if key in st.session_state:
                     del st.session_state[key]
             st.rerun()
     
     return selected_language, language_code
 
+def current_history_owner():
+    """Partition key of the signed-in user's saved transcriptions"""
+    return history_owner(st.session_state.get('user_email') or st.session_state.get('user_name'))
+
 def render_transcription_history(search_query, language_filter, prefix=""):
     """Render transcription history with filtering and actions"""
     # Start scrollable container
     st.markdown('<div class="scrollable-history">', unsafe_allow_html=True)
     
     # Display filtered history
-    if not st.session_state.transcription_history:
+    owner = current_history_owner()
+    if not count_transcriptions(owner):
         st.info("No transcriptions yet")
     else:
-        # Filter transcriptions
+        # Filter transcriptions (newest first, one page of them)
         filtered_history = filter_transcriptions(
-            st.session_state.transcription_history, 
+            owner, 
             search_query, 
-            language_filter
+            language_filter,
+            limit=HISTORY_PAGE_SIZE
         )
         
         # Display transcriptions in chat bubble style with actions
-        for original_index, item in reversed(filtered_history):
+        for item in filtered_history:
             # Escape quotes in transcription for JavaScript
             escaped_transcription = item['transcription'].replace("'", "\\'").replace('"', '\\"').replace('`', '\\`')
-            element_id = f"{prefix}_{original_index}"
+            element_id = f"{prefix}_{item['id'].replace('-', '')}"
             
             st.markdown(f"""
             <div class="chat-bubble">
@@ -794,7 +815,8 @@ def render_history_grid():
     """Render transcription history in a vertical card format"""
     st.markdown('<h1 class="kasuku-title"> Saved Transcriptions </h1>', unsafe_allow_html=True)
     
-    if not st.session_state.transcription_history:
+    owner = current_history_owner()
+    if not count_transcriptions(owner):
         st.markdown("""
         <div style='text-align: center; padding: 3rem; color: #666;'>
             <span class="material-symbols-outlined" style="font-size: 48px;">history</span>
@@ -823,14 +845,10 @@ def render_history_grid():
         )
     
     # Filter transcriptions
-    filtered_history = filter_transcriptions(
-        st.session_state.transcription_history,
-        search_query,
-        language_filter
-    )
+    match_count = count_transcriptions(owner, search_query, language_filter)
     
     # Clear All button - positioned below search/filter but above cards
-    if filtered_history:
+    if match_count:
         # Create a centered container for the Clear All button
         clear_col1, clear_col2, = st.columns([2, 1])
         with clear_col2:
@@ -839,22 +857,33 @@ def render_history_grid():
                         icon=":material/clear_all:",
                         use_container_width=True,
                         key="history_clear_all"):
-                if st.session_state.transcription_history:
-                    st.session_state.transcription_history = []
+                if clear_transcriptions(owner):
                     st.success("All transcriptions cleared!")
                     st.rerun()
     
-    # Filter transcriptions
-    filtered_history = filter_transcriptions(
-        st.session_state.transcription_history,
-        search_query,
-        language_filter
-    )
-    
-    if not filtered_history:
+    if not match_count:
         st.info("No transcriptions match your search criteria.")
         return
     
+    # Bulk speech for everything shown, newest first like the cards
+    bulk_col1, bulk_col2, bulk_col3 = st.columns([1, 1, 1], vertical_alignment="center")
+    with bulk_col2:
+        export_zip = st.checkbox("Export audio as zip", value=True, key="bulk_speech_zip")
+    with bulk_col3:
+        if st.button("Synthesize All",
+                    icon=":material/record_voice_over:",
+                    use_container_width=True,
+                    key="bulk_speech_start"):
+            previous_job = st.session_state.get('bulk_speech_job')
+            if previous_job is not None:
+                previous_job.cancel()
+            st.session_state.bulk_speech_job = synthesize_history(
+                filter_transcriptions(owner, search_query, language_filter),
+                gender=st.session_state.get('tts_voice_gender', 'Female'),
+                build_zip=export_zip
+            )
+    render_bulk_speech_progress()
+    
     # Add CSS for the vertical card styling
     st.markdown("""
     <style>
@@ -980,17 +1009,201 @@ def render_history_grid():
     # Start the cards container
     st.markdown('<div class="transcription-cards-container">', unsafe_allow_html=True)
     
-    # Display transcriptions vertically (newest first)
-    filtered_history = list(reversed(filtered_history))
-    
-    for original_index, item in filtered_history:
-        render_transcription_card(item, original_index)
+    # Display transcriptions vertically (newest first), a page at a time so
+    # only the cards being shown are loaded
+    limit = st.session_state.get('history_limit', HISTORY_PAGE_SIZE)
+    for item in filter_transcriptions(owner, search_query, language_filter, limit=limit):
+        render_transcription_card(item)
     
     # Close the cards container
     st.markdown('</div>', unsafe_allow_html=True)
+    
+    if match_count > limit:
+        if st.button(f"Show More ({match_count - limit} older)",
+                    icon=":material/expand_more:",
+                    use_container_width=True,
+                    key="history_show_more"):
+            st.session_state.history_limit = limit + HISTORY_PAGE_SIZE
+            st.rerun()
+
+def render_bulk_speech_progress():
+    """
+    Progress of the history's bulk speech job. While the job runs, the
+    progress view is a fragment that refreshes itself every half second
+    without rerunning the rest of the page.
+    """
+    job = st.session_state.get('bulk_speech_job')
+    if job is None:
+        return
+    polling = not job.finished
+    st.fragment(_bulk_speech_progress, run_every=0.5 if polling else None)(polling)
+
+def _bulk_speech_progress(polling):
+    job = st.session_state.get('bulk_speech_job')
+    if job is None:
+        return
+    
+    progress = job.progress()
+    label = f"Synthesized {progress['done']} of {progress['total']} transcriptions"
+    if progress['failed']:
+        label += f" ({progress['failed']} failed)"
+    st.progress(progress['fraction'], text=label)
+    
+    if not progress['finished']:
+        return
+    if polling:
+        # One full rerun to stop the timer; that run shows the results
+        st.rerun()
+    
+    for item, result in zip(job.items, job.results):
+        if isinstance(result, str):
+            st.warning(f"{item['timestamp']}: {result}")
+    if job.zip_bytes is not None:
+        st.download_button(
+            "Download Audio",
+            data=job.zip_bytes,
+            file_name=f"kasuku_audio_{time.strftime('%Y%m%d_%H%M%S', time.localtime(job.started))}.zip",
+            mime="application/zip",
+            icon=":material/download:",
+            key="bulk_speech_download"
+        )
+
+def _speech_chunk_html(audio_url, mimetype, run, index):
+    """
+    Hidden player for one chunk of synthesized speech. Chunks of the same
+    run play back to back: each waits (via a small registry on the parent
+    page) for the previous one to end, so playback starts with the first
+    chunk while later ones are still being synthesized.
+    """
+    return f"""
+    <audio id="chunk" data-run="{run}" preload="auto">
+        <source src="{audio_url}" type="{mimetype}">
+    </audio>
+    <script>
+    (function() {{
+        var audio = document.getElementById("chunk");
+        var index = {index};
+        var run;
+        try {{
+            var registry = window.parent.kasukuSpeech = window.parent.kasukuSpeech || {{}};
+            run = registry["{run}"] = registry["{run}"] || {{finished: -1, waiting: {{}}, started: {{}}}};
+        }} catch (e) {{
+            run = {{finished: index - 1, waiting: {{}}, started: {{}}}};
+        }}
+        // A player re-mounted by a later rerun must not play its chunk again
+        if (run.started[index]) {{
+            return;
+        }}
+        function start() {{
+            run.started[index] = true;
+            audio.onended = function() {{
+                run.finished = index;
+                var next = run.waiting[index + 1];
+                if (next) {{
+                    delete run.waiting[index + 1];
+                    next();
+                }}
+            }};
+            audio.play();
+        }}
+        if (run.finished >= index - 1) {{
+            start();
+        }} else {{
+            run.waiting[index] = start;
+        }}
+    }})();
+    </script>
+    """
+
+@st.fragment
+def render_speak_button(text, lang_code, button_key, audio_state_key):
+    """
+    Speak button that synthesizes in the background. A click only reruns
+    this fragment; a nested fragment then polls the TTS chunk futures and
+    starts playing as soon as the first chunk is ready, so the rest of the
+    page stays responsive. Polling stops once every chunk is done.
+    """
+    pending_key = f"pending_{button_key}"
+    
+    if st.button(":material/volume_up:", key=button_key, help="Speak", type="tertiary"):
+        if not text.strip():
+            st.error("Failed to generate speech.")
+            return
+        selected_gender = st.session_state.get('tts_voice_gender', 'Female')
+        st.session_state[pending_key] = {
+            'chunks': text_to_speech_stream(text, language=lang_code, gender=selected_gender),
+            'gender': selected_gender,
+            'run': random.randint(0, 1000000),
+            'announced': False,
+            'done': False,
+            'error': None
+        }
+    
+    pending = st.session_state.get(pending_key)
+    if pending is None:
+        return
+    polling = not pending['done']
+    st.fragment(_speech_playback, run_every=0.25 if polling else None)(button_key, audio_state_key, polling)
+
+def _speech_playback(button_key, audio_state_key, polling):
+    pending_key = f"pending_{button_key}"
+    pending = st.session_state.get(pending_key)
+    if pending is None:
+        return
+    
+    if pending['error'] is not None and not polling:
+        del st.session_state[pending_key]
+        st.error(f"Failed to generate speech: {pending['error']}")
+        return
+    
+    # Render the ready prefix of chunks; the same chunks render identically
+    # on every poll, so players that already started are left alone. Audio
+    # is served by URL from the media file manager, not inlined.
+    ready = 0
+    for index, future in enumerate(pending['chunks']):
+        if not future.done():
+            break
+        try:
+            speech = future.result()
+        except Exception as e:
+            pending['error'] = str(e)
+            break
+        mimetype = TTS_MIMETYPES[speech['format']]
+        audio_url = speech_media_url(speech['audio'], f"speech.{button_key}.{pending['run']}.{index}", mimetype)
+        st_html(_speech_chunk_html(audio_url, mimetype, pending['run'], index), height=0)
+        ready += 1
+    
+    if ready and not pending['announced']:
+        st.toast("Playing transcription")
+        pending['announced'] = True
+    
+    if pending['error'] is None and ready < len(pending['chunks']):
+        return
+    
+    if not pending['done']:
+        pending['done'] = True
+        if pending['error'] is None:
+            # Session state only references the audio; the bytes stay in the TTS cache
+            # (see backend.speech_media_url)
+            chunks = [future.result() for future in pending['chunks']]
+            st.session_state[audio_state_key] = {
+                'keys': [chunk['key'] for chunk in chunks],
+                'format': chunks[-1]['format'],
+                'gender': pending['gender'],
+                'engine': chunks[-1]['engine']
+            }
+            
+            if 'audio_data' not in st.session_state:
+                st.session_state.audio_data = {}
+            st.session_state.audio_data.update(st.session_state[audio_state_key])
+    
+    if polling:
+        # One full rerun to stop the timer; the players render unchanged in
+        # it and stay on the page so playback isn't cut short
+        st.rerun()
 
 # --- UPDATED FUNCTION ---
-def render_transcription_card(item, original_index):
+def render_transcription_card(item):
     """Render a single transcription card with Material Icon buttons"""
     from st_copy import copy_button
 
@@ -1031,59 +1244,15 @@ def render_transcription_card(item, original_index):
     # Speak button
     with cols[0]:
         st.markdown('<div class="icon-btn speak-btn size-xlarge">', unsafe_allow_html=True)
-        speak_button_clicked = st.button(
-            ":material/volume_up:",
-            key=f"speak_{original_index}",
-            help="Speak",
-            type="tertiary",
-            use_container_width=False
-        )
-        
-        if speak_button_clicked:
-                selected_gender = st.session_state.get('tts_voice_gender', 'Female')
-                
-                # 1. GET BASE64 DIRECTLY
-                audio_base64, engine_used = text_to_speech(
-                    transcription_text,
-                    language=lang_code,
-                    gender=selected_gender
-                )
-                
-                if audio_base64:
-                    # Save audio data to session state
-                    audio_data_key = f"audio_{original_index}"
-                    st.session_state[audio_data_key] = {
-                        'base64': audio_base64,
-                        'format': "mp3",
-                        'gender': selected_gender,
-                        'engine': engine_used
-                        # No more 'file_path' or 'pending_cleanup'
-                    }
-                    
-                    # 2. PLAY FILE using the stored base64 data
-                    r = random.randint(0, 1000000)
-                audio_html = f"""
-                <audio autoplay data-run="{r}">
-                    <source src="data:audio/mp3;base64,{audio_base64}" type="audio/mp3">
-                </audio>
-                """
-                # --- END OF DEFINITION ---
-                
-                # Now this line will work
-                st_html(audio_html, height=0) 
-                
-                st.toast(f"Playing transcription")
-                
-                if 'audio_data' not in st.session_state:
-                    st.session_state.audio_data = {}
-                st.session_state.audio_data.update(st.session_state[audio_data_key])
-                
+        render_speak_button(transcription_text, lang_code,
+                            button_key=f"speak_{item['id']}",
+                            audio_state_key=f"audio_{item['id']}")
         st.markdown('</div>', unsafe_allow_html=True)
 
     # Copy button
     with cols[1]:
         st.markdown('<div class="icon-btn copy-btn">', unsafe_allow_html=True)
-        copy_button(transcription_text, key=f"copy_{original_index}")
+        copy_button(transcription_text, key=f"copy_{item['id']}")
         st.markdown('</div>', unsafe_allow_html=True)
 
     # Delete button
@@ -1091,12 +1260,13 @@ def render_transcription_card(item, original_index):
         st.markdown('<div class="icon-btn delete-btn">', unsafe_allow_html=True)
         if st.button(
             ":material/delete:",
-            key=f"delete_{original_index}",
+            key=f"delete_{item['id']}",
             help="Delete",
             type="tertiary",
             use_container_width=False
         ):
-            delete_transcription(original_index, st.session_state.transcription_history)
+            delete_transcription(item['id'], current_history_owner())
+            st.session_state.pop(f"audio_{item['id']}", None)
             st.rerun()
         st.markdown('</div>', unsafe_allow_html=True)
 
@@ -1130,6 +1300,80 @@ def render_main_interface(show_welcome=True):
     
     return col1, col2, col3
 
+def render_live_transcription(processor, model, device, language_code, selected_language):
+    """
+    Live captions: stream microphone frames through a StreamingTranscriber and
+    show stable text plus the still-changing tail while the user speaks.
+    The final transcript becomes the current transcription when recording stops.
+    """
+    try:
+        from streamlit_webrtc import webrtc_streamer, WebRtcMode
+    except ImportError:
+        st.info("Live captions need the streamlit-webrtc package: pip install streamlit-webrtc")
+        return
+    import queue
+    import numpy as np
+    from backend import StreamingTranscriber
+    
+    ctx = webrtc_streamer(
+        key=f"live_transcription_{language_code}",
+        mode=WebRtcMode.SENDONLY,
+        audio_receiver_size=1024,
+        media_stream_constraints={"audio": True, "video": False},
+    )
+    captions = st.empty()
+    
+    def show_captions(transcriber):
+        captions.markdown(f"""
+        <div style="border: 2px dashed #4CAF50; border-radius: 5px; padding: 16px; background-color: #F4FFE6; margin: 10px 0;">
+            <span style="font-size: 18px; color: #1A1A1A;">{html.escape(transcriber.stable_text)}</span>
+            <span style="font-size: 18px; color: #888;"> {html.escape(transcriber.partial_text)}</span>
+        </div>
+        """, unsafe_allow_html=True)
+    
+    if ctx.state.playing and ctx.audio_receiver:
+        # Reruns during a recording keep its transcriber (and so the text
+        # and audio so far); a new recording gets a new audio receiver
+        transcriber = st.session_state.get('live_transcriber')
+        if (transcriber is None
+                or st.session_state.get('live_audio_receiver') is not ctx.audio_receiver
+                or transcriber.language != language_code):
+            transcriber = StreamingTranscriber(processor, model, device, language_code)
+            st.session_state.live_transcriber = transcriber
+            st.session_state.live_audio_receiver = ctx.audio_receiver
+        else:
+            show_captions(transcriber)
+        st.session_state.show_welcome = False
+        
+        while ctx.state.playing:
+            try:
+                frames = ctx.audio_receiver.get_frames(timeout=1)
+            except queue.Empty:
+                continue
+            
+            # Buffer the whole batch, then decode at most once. A batch longer
+            # than the update interval means decoding is falling behind, so
+            # skip the partial hypothesis until the backlog is drained.
+            queued_seconds = 0.0
+            for frame in frames:
+                channels = len(frame.layout.channels)
+                samples = frame.to_ndarray().reshape(-1, channels).astype(np.float32) / 32768.0
+                transcriber.append(samples, frame.sample_rate)
+                queued_seconds += frame.samples / frame.sample_rate
+            if transcriber.update(partial=queued_seconds <= transcriber.update_seconds):
+                show_captions(transcriber)
+    
+    elif st.session_state.get('live_transcriber') is not None:
+        # Recording stopped - finalize the remaining audio
+        transcriber = st.session_state.live_transcriber
+        st.session_state.live_transcriber = None
+        st.session_state.live_audio_receiver = None
+        with st.spinner("Finishing transcription..."):
+            transcription = transcriber.finish()
+        if transcription:
+            st.session_state.current_transcription = transcription
+            st.session_state.current_transcription_language = selected_language
+
 # --- UPDATED FUNCTION ---
 def render_transcription_result(transcription, selected_language):
     """Render the transcription result with Material Icon action buttons"""
@@ -1155,6 +1399,13 @@ def render_transcription_result(transcription, selected_language):
     
     lang_code = "sw" if selected_language == "Swahili" else "en"
     
+    # Start synthesizing the result in the selected voice before anyone
+    # clicks speak (opt-in, see backend.prefetch_speech); once per text and voice
+    prefetch_request = (clean_transcription, lang_code, st.session_state.get('tts_voice_gender', 'Female'))
+    if st.session_state.get('speech_prefetched') != prefetch_request:
+        st.session_state.speech_prefetched = prefetch_request
+        prefetch_speech(*prefetch_request)
+    
     # Display transcription
     with st.container():
         st.markdown(f"""
@@ -1170,48 +1421,9 @@ def render_transcription_result(transcription, selected_language):
     # Speak
     with cols[0]:
         st.markdown('<div class="icon-btn speak-btn">', unsafe_allow_html=True)
-        speak_button_clicked = st.button(":material/volume_up:", key="speak_btn", help="Speak", type="tertiary")
-        
-        if speak_button_clicked:
-            if clean_transcription.strip():
-                    selected_gender = st.session_state.get('tts_voice_gender', 'Female')
-                    
-                    # 1. GET BASE64 DIRECTLY
-                    audio_base64, engine_used = text_to_speech(
-                        clean_transcription,
-                        language=lang_code,
-                        gender=selected_gender
-                    )
-                    
-                    if audio_base64:
-                        # Save audio data to session state
-                        st.session_state.current_audio_data = {
-                            'base64': audio_base64,
-                            'format': "mp3",
-                            'gender': selected_gender,
-                            'engine': engine_used
-                            # No more 'file_path' or 'pending_cleanup'
-                        }
-                        
-                        # 2. PLAY FILE using the stored base64 data
-                        r = random.randint(0,1000000) 
-                    audio_html = f"""
-                    <audio autoplay data-run="{r}">
-                        <source src="data:audio/mp3;base64,{audio_base64}" type="audio/mp3">
-                    </audio>
-                    """
-                    # --- END OF DEFINITION ---
-
-                    # Now this line will work
-                    st_html(audio_html, height=0) 
-                    
-                    st.toast(f"Playing transcription ")
-                    
-                    if 'audio_data' not in st.session_state:
-                        st.session_state.audio_data = {}
-                    st.session_state.audio_data.update(st.session_state.current_audio_data)
-            else:
-                    st.error("Failed to generate speech.")
+        render_speak_button(clean_transcription, lang_code,
+                            button_key="speak_btn",
+                            audio_state_key="current_audio_data")
         st.markdown('</div>', unsafe_allow_html=True)
 
     # Copy
@@ -1224,14 +1436,12 @@ def render_transcription_result(transcription, selected_language):
     with cols[2]:
         st.markdown('<div class="icon-btn save-btn">', unsafe_allow_html=True)
         if st.button(":material/bookmark:", key="save_btn", help="Save", type="tertiary"):
-            from backend import create_transcription_item
-
-            transcription_item = create_transcription_item(
+            save_transcription_to_history(
                 clean_transcription,
                 selected_language,
-                st.session_state.user_name
+                st.session_state.user_name,
+                current_history_owner()
             )
-            st.session_state.transcription_history.append(transcription_item)
             st.session_state.current_transcription = None
             st.session_state.current_transcription_language = None
             st.rerun()
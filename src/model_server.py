@@ -0,0 +1,133 @@
+# model_server.py - Shared inference server for the Whisper models
+"""
+Owns one copy of each Whisper model and serves transcriptions over localhost
+HTTP, so several Streamlit processes on the same host can share the weights.
+
+Run the server:
+    python src/model_server.py --port 8765
+
+Then start each UI process as a thin client:
+    KASUKU_MODEL_SERVER_URL=http://127.0.0.1:8765 streamlit run src/app.py
+
+Endpoints:
+    POST /transcribe?language=sw   body: 16 kHz mono float32 (little-endian) samples
+    GET  /health                   model residency, load times, warm-up timings
+    GET  /ready                    200 once warm-up has finished, 503 before
+"""
+import argparse
+import json
+import os
+import sys
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlparse, parse_qs
+
+# The server always owns the weights itself, never delegates to another server
+os.environ.pop("KASUKU_MODEL_SERVER_URL", None)
+
+import numpy as np
+
+import backend
+
+
+class TranscriptionHandler(BaseHTTPRequestHandler):
+    """HTTP handler for /transcribe and /health"""
+
+    manager = None
+
+    def _send_json(self, status, payload):
+        body = json.dumps(payload).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_GET(self):
+        path = urlparse(self.path).path
+        if path == "/ready":
+            readiness = backend.get_readiness()
+            self._send_json(200 if readiness["state"] == "ready" else 503, readiness)
+        elif path == "/health":
+            self._send_json(200, {
+                "status": "ok",
+                "readiness": backend.get_readiness(),
+                "models": self.manager.loaded(),
+                "model_manager": self.manager.stats(),
+                "transcription_cache": backend.get_transcription_cache().stats(),
+            })
+        else:
+            self._send_json(404, {"error": "Not found"})
+
+    def do_POST(self):
+        url = urlparse(self.path)
+        if url.path != "/transcribe":
+            self._send_json(404, {"error": "Not found"})
+            return
+
+        language = parse_qs(url.query).get("language", ["sw"])[0]
+        try:
+            length = int(self.headers.get("Content-Length", 0))
+            audio_data = np.frombuffer(self.rfile.read(length), dtype="<f4").astype(np.float32)
+            processor, model, device = self.manager.get(language)
+            transcription = backend.transcribe_audio(
+                processor, model, device, audio_data, language
+            )
+        except Exception as e:
+            self._send_json(500, {"error": str(e)})
+            return
+
+        if transcription is None:
+            self._send_json(500, {"error": "Transcription failed"})
+        else:
+            self._send_json(200, {"transcription": transcription})
+
+    def log_message(self, format, *args):
+        # Keep request logging out of the way of model loading output
+        pass
+
+
+def run_server(host="127.0.0.1", port=8765, preload=(), warmup=False):
+    """
+    Start the model server and block until interrupted. With warmup, the
+    preloaded languages (or all of them) are warmed in the background while
+    the server already answers /health and /ready.
+    """
+    manager = backend.ModelManager()
+    for language in preload:
+        manager.get(language)
+    
+    if warmup:
+        threading.Thread(
+            target=backend.warm_up_models, args=(list(preload) or None, manager),
+            name="kasuku-warmup", daemon=True
+        ).start()
+    else:
+        backend._set_readiness(state="ready")
+
+    handler = type("Handler", (TranscriptionHandler,), {"manager": manager})
+    server = ThreadingHTTPServer((host, port), handler)
+    server.daemon_threads = True
+    print(f"🦜 Kasuku model server listening on http://{host}:{port}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Kasuku shared Whisper model server")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--preload", nargs="*", default=[], choices=sorted(backend.MODEL_NAMES),
+                        help="Languages to load before accepting requests")
+    parser.add_argument("--warmup", action="store_true", default=backend.WARMUP_ENABLED,
+                        help="Run dummy clips through the models at startup (default: KASUKU_WARMUP)")
+    args = parser.parse_args(argv)
+    run_server(args.host, args.port, args.preload, args.warmup)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
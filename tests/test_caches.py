@@ -0,0 +1,50 @@
+import os
+
+import backend
+
+def test_disk_tier_evicts_least_recently_used_down_to_low_water(tmp_path):
+    cache = backend.TTSAudioCache(cache_dir=tmp_path, max_disk_bytes=1000, max_memory_bytes=0)
+    for key in "abcd":
+        cache.put(key, b"x" * 300)
+    
+    # The fourth clip goes over budget: the oldest files go until <= 900 bytes
+    assert sorted(path.stem for path in tmp_path.glob("*.mp3")) == ["b", "c", "d"]
+    assert cache.stats()["disk_bytes"] == 900
+    assert cache.stats()["evictions"] == 1
+    
+    assert cache.get("b") == b"x" * 300
+    cache.put("e", b"x" * 300)
+    assert sorted(path.stem for path in tmp_path.glob("*.mp3")) == ["b", "d", "e"]
+
+def test_disk_index_survives_restart_and_picks_up_shared_files(tmp_path):
+    cache = backend.TranscriptionCache(max_entries=1, cache_dir=tmp_path)
+    cache.put("one", "Habari ya asubuhi")
+    
+    reopened = backend.TranscriptionCache(max_entries=1, cache_dir=tmp_path)
+    assert reopened.stats()["disk_bytes"] == os.path.getsize(tmp_path / "one.json")
+    assert reopened.get("one") == "Habari ya asubuhi"
+    
+    # Another process writes into the shared folder after startup
+    backend.TranscriptionCache(cache_dir=tmp_path).put("two", "Habari ya jioni")
+    assert reopened.get("two") == "Habari ya jioni"
+    assert reopened.stats()["disk_entries"] == 2
+    assert (reopened.stats()["disk_hits"], reopened.stats()["misses"]) == (2, 0)
+
+def test_contains_does_not_count_as_a_lookup(tmp_path):
+    cache = backend.TTSAudioCache(cache_dir=tmp_path)
+    cache.put("a", b"audio")
+    
+    assert cache.contains("a")
+    assert not cache.contains("b")
+    assert backend.TTSAudioCache(cache_dir=tmp_path).contains("a")
+    assert (cache.stats()["hits"], cache.stats()["misses"]) == (0, 0)
+
+def test_memory_hits_keep_their_files_from_being_evicted_first(tmp_path):
+    cache = backend.TTSAudioCache(cache_dir=tmp_path, max_disk_bytes=1000)
+    for key in "abc":
+        cache.put(key, b"x" * 300)
+    
+    # "a" is replayed from memory, so "b" is now the least recently used file
+    assert cache.get("a") == b"x" * 300
+    cache.put("d", b"x" * 300)
+    assert sorted(path.stem for path in tmp_path.glob("*.mp3")) == ["a", "c", "d"]
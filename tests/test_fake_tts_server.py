@@ -0,0 +1,34 @@
+import base64
+import json
+import threading
+import urllib.error
+import urllib.request
+
+import pytest
+
+from fake_tts_server import create_server
+
+@pytest.fixture
+def endpoint():
+    server = create_server(port=0)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    yield f"http://127.0.0.1:{server.server_address[1]}"
+    server.shutdown()
+    server.server_close()
+
+def synthesize(endpoint, audio_encoding):
+    body = {"input": {"text": "Habari ya asubuhi"}, "voice": {"languageCode": "sw-KE"},
+            "audioConfig": {"audioEncoding": audio_encoding}}
+    request = urllib.request.Request(f"{endpoint}/v1/text:synthesize", data=json.dumps(body).encode(),
+                                     headers={"Content-Type": "application/json"}, method="POST")
+    with urllib.request.urlopen(request) as response:
+        return base64.b64decode(json.loads(response.read())["audioContent"])
+
+def test_audio_matches_the_requested_encoding(endpoint):
+    for mp3 in (synthesize(endpoint, "MP3"), synthesize(endpoint, 2)):
+        assert mp3.startswith(b"ID3") or mp3[0] == 0xFF
+    assert synthesize(endpoint, "LINEAR16")[:4] == b"RIFF"
+    
+    with pytest.raises(urllib.error.HTTPError) as error:
+        synthesize(endpoint, "OGG_OPUS")
+    assert error.value.code == 400
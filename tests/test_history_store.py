@@ -0,0 +1,69 @@
+import backend
+
+def make_store(tmp_path):
+    return backend.TranscriptionStore(str(tmp_path / "history.sqlite3"))
+
+def add(store, owner, text, language="Swahili"):
+    return store.add(owner, backend.create_transcription_item(text, language, owner))
+
+def test_search_folds_non_ascii_case(tmp_path):
+    store = make_store(tmp_path)
+    add(store, "a@example.com", "Rendez-vous à l'ÉCOLE demain", "English")
+    add(store, "a@example.com", "Straße gesperrt", "English")
+    add(store, "a@example.com", "Habari ya asubuhi")
+    
+    assert [item["transcription"] for item in store.query("a@example.com", "école")] == [
+        "Rendez-vous à l'ÉCOLE demain"
+    ]
+    assert store.count("a@example.com", "STRASSE") == 1
+    assert store.count("a@example.com", "HABARI") == 1
+
+def test_history_is_partitioned_and_deleted_by_id(tmp_path):
+    store = make_store(tmp_path)
+    first = add(store, "a@example.com", "Habari ya asubuhi")
+    second = add(store, "a@example.com", "Habari ya jioni")
+    add(store, "b@example.com", "Habari ya mchana")
+    
+    assert [item["id"] for item in store.query("a@example.com")] == [second["id"], first["id"]]
+    assert store.delete("b@example.com", first["id"]) is None
+    assert store.delete("a@example.com", first["id"])["id"] == first["id"]
+    assert store.count("a@example.com") == 1
+    assert store.count("b@example.com") == 1
+
+def make_replica(tmp_path, replica):
+    return backend.TranscriptionStore(str(tmp_path / replica / "history.sqlite3"),
+                                      backup_dir=str(tmp_path / "volume"), backup_delay=60,
+                                      sync_interval=0, replica=replica)
+
+def test_replicas_share_history_through_the_backup_folder(tmp_path):
+    first = make_replica(tmp_path, "a")
+    kept = add(first, "a@example.com", "Habari ya asubuhi")
+    dropped = add(first, "a@example.com", "Habari ya jioni")
+    first.backup()
+    
+    # A new replica starts with everything saved so far
+    second = make_replica(tmp_path, "b")
+    assert second.count("a@example.com") == 2
+    
+    # A deletion on one replica isn't undone by the other's older copy
+    second.delete("a@example.com", dropped["id"])
+    added = add(second, "a@example.com", "Habari ya mchana")
+    second.backup()
+    assert first.sync() == 1
+    assert [item["id"] for item in first.query("a@example.com")] == [added["id"], kept["id"]]
+    
+    first.backup()
+    assert second.sync() == 1
+    assert second.get("a@example.com", dropped["id"]) is None
+    assert second.sync() == 0
+
+def test_clear_is_merged_into_other_replicas(tmp_path):
+    first = make_replica(tmp_path, "a")
+    add(first, "a@example.com", "Habari ya asubuhi")
+    first.backup()
+    second = make_replica(tmp_path, "b")
+    
+    second.clear("a@example.com")
+    second.backup()
+    first.sync()
+    assert first.count("a@example.com") == 0
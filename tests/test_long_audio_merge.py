@@ -0,0 +1,53 @@
+from types import SimpleNamespace
+
+import backend
+
+SAMPLE_RATE = 16000
+
+def window(start, end):
+    return start * SAMPLE_RATE, end * SAMPLE_RATE
+
+def output(segments, truncated=False):
+    """Decoder output as _decode_features returns it, with window-relative times"""
+    return {
+        "text": " ".join(text for _, _, text in segments),
+        "offsets": [{"text": text, "timestamp": (start, end)} for start, end, text in segments],
+        "truncated": truncated,
+    }
+
+def test_segment_crossing_window_boundary_is_kept():
+    # "C" runs from 25 s to 31 s: the first window stops decoding inside it
+    # (so it is missing from its offsets), the second hears it from 27 s on
+    windows = [window(0, 30), window(27, 57)]
+    outputs = [
+        output([(0.0, 12.0, "A"), (12.0, 25.0, "B")], truncated=True),
+        output([(0.0, 4.0, "C"), (4.0, 20.0, "D")]),
+    ]
+    assert backend._merge_timestamped_windows(windows, outputs, SAMPLE_RATE) == "A B C D"
+
+def test_overlap_is_not_duplicated():
+    windows = [window(0, 30), window(27, 57)]
+    outputs = [
+        output([(0.0, 20.0, "A"), (20.0, 28.0, "B")]),
+        output([(0.0, 1.0, "B"), (2.0, 20.0, "C")]),
+    ]
+    assert backend._merge_timestamped_windows(windows, outputs, SAMPLE_RATE) == "A B C"
+
+def test_fully_truncated_window_hands_over_to_next():
+    windows = [window(0, 30), window(27, 57), window(54, 60)]
+    outputs = [
+        output([(0.0, 26.0, "A")]),
+        output([], truncated=True),
+        output([(0.0, 5.0, "B")]),
+    ]
+    assert backend._merge_timestamped_windows(windows, outputs, SAMPLE_RATE) == "A B"
+
+def test_ends_mid_segment():
+    tokenizer = SimpleNamespace(all_special_ids=[50257, 50258, 50363])
+    first_timestamp = 50364
+    text = [400, 401]
+    complete = [50258, first_timestamp, *text, first_timestamp + 50, 50257]
+    cut_off = [50258, first_timestamp, *text, first_timestamp + 50, first_timestamp + 50, *text, 50257]
+    assert not backend._ends_mid_segment(complete, tokenizer)
+    assert backend._ends_mid_segment(cut_off, tokenizer)
+    assert backend._ends_mid_segment([50258, *text, 50257], tokenizer)
@@ -0,0 +1,28 @@
+import gc
+import weakref
+
+import torch
+
+import backend
+
+def test_evicted_model_is_released_while_a_session_still_uses_it(monkeypatch):
+    monkeypatch.setattr(backend, "MICROBATCH_ENABLED", True)
+    monkeypatch.setattr(backend, "_decode_features",
+                        lambda processor, model, device, features, *args: ["habari"] * features.shape[0])
+    manager = backend.ModelManager(model_names={"sw": "tiny-sw", "en": "tiny-en"}, budget_mb=0.00003,
+                                   loader=lambda name: (None, torch.nn.Linear(2, 2), "cpu"))
+    
+    # A session (e.g. a live transcriber) keeps the Swahili model while English evicts it
+    held = manager.get("sw")
+    model_ref = weakref.ref(held[1])
+    features = torch.zeros(1, 80, 3000)
+    assert backend._generate_from_features(*held, features, "sw") == ["habari"]
+    manager.get("en")
+    assert manager.loaded() == ["en"]
+    
+    assert backend._generate_from_features(*held, features, "sw") == ["habari"]
+    del held
+    gc.collect()
+    assert model_ref() is None
+    
+    backend.shutdown_batch_schedulers()
@@ -0,0 +1,25 @@
+import threading
+from http.server import ThreadingHTTPServer
+
+import numpy as np
+import pytest
+
+import backend
+import model_server
+
+def test_remote_model_reports_the_server_error():
+    def fail(model_name):
+        raise OSError(f"Can't load {model_name}")
+    
+    class Handler(model_server.TranscriptionHandler):
+        manager = backend.ModelManager(model_names={"sw": "missing/checkpoint"}, loader=fail)
+    
+    server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    try:
+        remote = backend.RemoteModel(f"http://127.0.0.1:{server.server_address[1]}", "sw")
+        with pytest.raises(RuntimeError, match="Can't load missing/checkpoint"):
+            remote.transcribe(np.zeros(1600, dtype=np.float32))
+    finally:
+        server.shutdown()
+        server.server_close()
@@ -0,0 +1,39 @@
+import numpy as np
+
+import backend
+
+def make_transcriber(monkeypatch):
+    transcriber = backend.StreamingTranscriber(None, None, "cpu", "sw", update_seconds=2.0,
+                                               max_buffer_seconds=20.0)
+    decoded = []
+    
+    def transcribe(audio_data):
+        decoded.append(len(audio_data) / transcriber.SAMPLE_RATE)
+        return ["neno"]
+    
+    monkeypatch.setattr(transcriber, "_transcribe", transcribe)
+    return transcriber, decoded
+
+def test_backlog_is_buffered_and_decoded_once(monkeypatch):
+    transcriber, decoded = make_transcriber(monkeypatch)
+    frame = np.full(320, 0.1, dtype=np.float32)  # 20 ms at 16 kHz
+    
+    # 10 s arrived while the previous decode ran: no partial update for it
+    for _ in range(500):
+        transcriber.append(frame, 16000)
+    assert not transcriber.update(partial=False)
+    assert decoded == []
+    
+    # Caught up: one hypothesis over everything buffered
+    assert transcriber.update()
+    assert decoded == [10.0]
+
+def test_full_buffer_is_finalized_even_when_behind(monkeypatch):
+    transcriber, decoded = make_transcriber(monkeypatch)
+    transcriber.append(np.full(45 * 16000, 0.1, dtype=np.float32), 16000)
+    
+    assert transcriber.update(partial=False)
+    # Two cuts of at most 20 s each, no partial hypothesis of the rest
+    assert len(decoded) == 2 and max(decoded) <= 20.0
+    assert transcriber.final_text == "neno neno"
+    assert transcriber.partial_text == ""
@@ -0,0 +1,69 @@
+import base64
+import io
+import wave
+
+import backend
+
+class FakeEngine:
+    def __init__(self, name, audio_format, fail_on=None):
+        self.name = name
+        self.audio_format = audio_format
+        self.fail_on = fail_on
+    
+    def voice(self, language, gender):
+        return language, f"{self.name}-{gender}"
+    
+    def synthesize(self, text, language="en", gender="Female", timeout=None):
+        if self.fail_on and self.fail_on in text:
+            raise RuntimeError("Service unavailable")
+        if self.audio_format == "mp3":
+            return b"\xff\xfb" + text.encode()
+        buffer = io.BytesIO()
+        with wave.open(buffer, "wb") as writer:
+            writer.setnchannels(1)
+            writer.setsampwidth(2)
+            writer.setframerate(16000)
+            writer.writeframes(b"\x00\x01" * len(text))
+        return buffer.getvalue()
+    
+    def stats(self):
+        return {}
+    
+    def close(self):
+        pass
+
+def test_text_to_speech_joins_when_the_fallback_answers_part_of_the_text(monkeypatch):
+    pool = backend.TTSClientPool(engine=FakeEngine("google", "mp3", fail_on="Second"),
+                                 fallback=FakeEngine("espeak-ng", "wav"), max_concurrency=2)
+    monkeypatch.setattr(backend, "get_tts_pool", lambda: pool)
+    text = "First sentence here. " * 40 + "Second sentence here. " * 40
+    assert len(backend.split_tts_text(text)) > 1
+    
+    try:
+        audio_base64, engine = backend.text_to_speech(text)
+    finally:
+        pool.close()
+    
+    assert engine == "espeak-ng"
+    with wave.open(io.BytesIO(base64.b64decode(audio_base64)), "rb") as reader:
+        assert reader.getnframes() == len("".join(backend.split_tts_text(text)))
+
+def test_bulk_job_keeps_cache_keys_and_zips_from_the_cache():
+    import zipfile
+    
+    pool = backend.TTSClientPool(engine=FakeEngine("google", "mp3"), max_concurrency=2)
+    items = [backend.create_transcription_item(text, "Swahili", "a@example.com")
+             for text in ("Habari ya asubuhi", "Habari ya jioni")]
+    job = backend.BulkSpeechJob(items, pool=pool, build_zip=True)
+    try:
+        job._run()
+        # Evicted audio is synthesized again for the zip
+        pool.cache._memory.pop(job.results[1][0]["key"])
+        job.zip_bytes = job._zip()
+    finally:
+        pool.close()
+    
+    assert all(set(chunk) == {"key", "format", "engine"} for chunks in job.results for chunk in chunks)
+    with zipfile.ZipFile(io.BytesIO(job.zip_bytes)) as archive:
+        audio = [archive.read(name) for name in sorted(archive.namelist()) if name.endswith(".mp3")]
+    assert audio == [b"\xff\xfbHabari ya asubuhi", b"\xff\xfbHabari ya jioni"]